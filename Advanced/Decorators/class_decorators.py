@@ -38,3 +38,294 @@ calc.substract(3,2)
 #Calling substract with args=(<__main__.Calculator object at 0x0000013C35D73590>, 3, 2) kwargs={}
 #substract returned 1
 
+
+
+#Example: trace_methods, a sampling tracer that can stay switched on in production
+"""log_methods prints two f-strings with the full args repr on every call. trace_methods has the same
+class-level use, but a traced call only stores a tuple in a fixed-size ring buffer; text is built
+later, when tracer.records() is read. sample_rate=0.01 records every 100th call. tracer.disable()
+puts the original methods back on every traced class, so a disabled tracer costs nothing per call."""
+
+import itertools
+import io
+import contextlib
+import threading
+import time
+import timeit
+
+class Tracer:
+    def __init__(self, capacity=4096, sample_rate=1.0):
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self._slots = itertools.count()  # next() on a count is atomic, so threads never share a slot
+        self.enabled = True
+        self.sample_rate = sample_rate
+        self._installed = []  # (cls, name, original, traced)
+
+    @property
+    def sample_rate(self):
+        return self._sample_rate
+
+    @sample_rate.setter
+    def sample_rate(self, rate):
+        if not 0 < rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self._sample_rate = rate
+        self._every = round(1 / rate)
+        self._calls = itertools.count()
+
+    def record(self, name, args, kwargs, result, started, duration):
+        self.buffer[next(self._slots) % self.capacity] = (name, args, kwargs, result, started, duration,
+                                                          threading.get_ident())
+
+    def wrap(self, original_method):
+        if isinstance(original_method, (staticmethod, classmethod)):
+            # Wrap the underlying function and keep the descriptor, so it still binds the same way
+            return type(original_method)(self.wrap(original_method.__func__))
+        name = original_method.__qualname__
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(original_method)
+        def traced(*args, **kwargs):
+            if next(self._calls) % self._every:
+                return original_method(*args, **kwargs)
+            started = clock()
+            result = original_method(*args, **kwargs)
+            record(name, args, kwargs, result, started, clock() - started)
+            return result
+        return traced
+
+    def install(self, cls, name, original_method):
+        traced = self.wrap(original_method)
+        self._installed.append((cls, name, original_method, traced))
+        setattr(cls, name, traced if self.enabled else original_method)
+
+    def enable(self):
+        self.enabled = True
+        for cls, name, _, traced in self._installed:
+            setattr(cls, name, traced)
+
+    def disable(self):
+        self.enabled = False
+        for cls, name, original_method, _ in self._installed:
+            setattr(cls, name, original_method)
+
+    def records(self, last=None):
+        """Format the buffered calls, oldest first"""
+        entries = [entry for entry in self.buffer if entry is not None]
+        entries.sort(key=lambda entry: entry[4])
+        lines = [f"{name} args={args} kwargs={kwargs} returned {result!r} in {duration * 1e6:.1f}us"
+                 for name, args, kwargs, result, _, duration, _ in entries]
+        return lines[-last:] if last else lines
+
+    def clear(self):
+        self.buffer = [None] * self.capacity
+
+
+default_tracer = Tracer()
+
+def trace_methods(cls=None, *, tracer=None):
+    """Use as @trace_methods or @trace_methods(tracer=my_tracer)"""
+    def decorate(cls):
+        chosen = tracer or default_tracer
+        for attr_name, attr_value in list(cls.__dict__.items()):
+            if callable(attr_value) or isinstance(attr_value, (staticmethod, classmethod)):
+                chosen.install(cls, attr_name, attr_value)
+        return cls
+    return decorate(cls) if cls is not None else decorate
+
+
+@trace_methods
+class TracedCalculator:
+    def add(self, a, b):
+        return a + b
+
+    def substract(self, a, b):
+        return a - b
+
+traced_calc = TracedCalculator()
+traced_calc.add(4, 5)
+traced_calc.substract(3, 2)
+print("\n".join(default_tracer.records()))
+#TracedCalculator.add args=(<__main__.TracedCalculator object at 0x...>, 4, 5) kwargs={} returned 9 in 0.4us
+#TracedCalculator.substract args=(<__main__.TracedCalculator object at 0x...>, 3, 2) kwargs={} returned 1 in 0.2us
+
+# Overhead per call (log_methods output is discarded so only its formatting cost is timed)
+class PlainCalculator:
+    def add(self, a, b):
+        return a + b
+
+plain_calc = PlainCalculator()
+calls = 200_000
+with contextlib.redirect_stdout(io.StringIO()):
+    logged = timeit.timeit(lambda: calc.add(4, 5), number=calls // 10) * 10
+results = {"plain method": timeit.timeit(lambda: plain_calc.add(4, 5), number=calls), "log_methods": logged}
+for label, rate in (("tracer, every call", 1.0), ("tracer, 1% sampled", 0.01)):
+    default_tracer.sample_rate = rate
+    results[label] = timeit.timeit(lambda: traced_calc.add(4, 5), number=calls)
+default_tracer.disable()
+results["tracer disabled"] = timeit.timeit(lambda: traced_calc.add(4, 5), number=calls)
+default_tracer.enable()
+for label, seconds in results.items():
+    print(f"{label:<20} {seconds / calls * 1e9:.0f} ns/call")
+
+
+#Example: profile_methods, per-method latency histograms with JSON / Prometheus export
+"""Times every public method with time.perf_counter_ns (a monotonic clock) into HDR-style histograms:
+log-linear buckets with 32 sub-buckets per power of two, so any percentile is within ~3% of the true
+value while a histogram stays a small dict. Each thread writes to its own shard (no locks on the hot
+path); snapshot() merges the shards into count / total / p50 / p99 / p999 / max per method."""
+
+import json
+import os
+import tempfile
+from collections import defaultdict
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+def _bucket_index(ns):
+    if ns < SUB_BUCKETS:
+        return ns
+    shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS
+
+def _bucket_upper(index):
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+class MethodProfiler:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []               # one {method: [count, total_ns, max_ns, {bucket: count}]} per thread
+        self._shards_lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = defaultdict(lambda: [0, 0, 0, defaultdict(int)])
+            with self._shards_lock:     # taken once per thread, never per call
+                self._shards.append(shard)
+        return shard
+
+    def wrap(self, original_method):
+        if isinstance(original_method, (staticmethod, classmethod)):
+            return type(original_method)(self.wrap(original_method.__func__))
+        name = original_method.__qualname__
+        clock = time.perf_counter_ns
+
+        @wraps(original_method)
+        def profiled(*args, **kwargs):
+            started = clock()
+            try:
+                return original_method(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                stats = self._shard()[name]
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+                stats[3][_bucket_index(elapsed)] += 1
+        return profiled
+
+    def snapshot(self):
+        merged = defaultdict(lambda: [0, 0, 0, defaultdict(int)])
+        for shard in list(self._shards):
+            for name, (count, total, maximum, buckets) in list(shard.items()):
+                stats = merged[name]
+                stats[0] += count
+                stats[1] += total
+                stats[2] = max(stats[2], maximum)
+                for index, bucket_count in list(buckets.items()):
+                    stats[3][index] += bucket_count
+        return {name: self._summary(*stats) for name, stats in sorted(merged.items())}
+
+    @staticmethod
+    def _summary(count, total, maximum, buckets):
+        summary = {"count": count, "total_seconds": total / 1e9, "max_seconds": maximum / 1e9}
+        ordered = sorted(buckets.items())
+        for label, quantile in (("p50", 0.5), ("p99", 0.99), ("p999", 0.999)):
+            target, seen = quantile * count, 0
+            for index, bucket_count in ordered:
+                seen += bucket_count
+                if seen >= target:
+                    summary[f"{label}_seconds"] = min(_bucket_upper(index), maximum) / 1e9
+                    break
+        return summary
+
+    def export_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+    def export_prometheus(self, path):
+        lines = ["# TYPE method_latency_seconds summary"]
+        for name, summary in self.snapshot().items():
+            for label, quantile in (("p50", "0.5"), ("p99", "0.99"), ("p999", "0.999")):
+                lines.append(f'method_latency_seconds{{method="{name}",quantile="{quantile}"}} '
+                             f'{summary[label + "_seconds"]:.9f}')
+            lines.append(f'method_latency_seconds_sum{{method="{name}"}} {summary["total_seconds"]:.9f}')
+            lines.append(f'method_latency_seconds_count{{method="{name}"}} {summary["count"]}')
+        with open(path, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+default_profiler = MethodProfiler()
+
+def profile_methods(cls=None, *, profiler=None):
+    """Use as @profile_methods or @profile_methods(profiler=my_profiler); only public methods are timed"""
+    def decorate(cls):
+        chosen = profiler or default_profiler
+        for attr_name, attr_value in list(cls.__dict__.items()):
+            is_method = callable(attr_value) or isinstance(attr_value, (staticmethod, classmethod))
+            if is_method and not attr_name.startswith("_"):
+                setattr(cls, attr_name, chosen.wrap(attr_value))
+        return cls
+    return decorate(cls) if cls is not None else decorate
+
+
+@profile_methods
+class ProfiledCalculator:
+    def add(self, a, b):
+        return a + b
+
+    def substract(self, a, b):
+        return a - b
+
+@profile_methods
+class ProfiledCheckout:  # same shape as composition.Checkout
+    def __init__(self, payment_processor):
+        self.payment_processor = payment_processor
+
+    def pay(self, amount):
+        time.sleep(0.001)  # stands in for the payment provider round trip
+        return f"Processed ${amount} with {self.payment_processor}."
+
+profiled_calc = ProfiledCalculator()
+checkout = ProfiledCheckout("PayPal")
+
+def busy_thread():
+    for i in range(20_000):
+        profiled_calc.add(i, 1)
+        profiled_calc.substract(i, 1)
+    for _ in range(20):
+        checkout.pay(100)
+
+workers = [threading.Thread(target=busy_thread) for _ in range(4)]
+for worker in workers:
+    worker.start()
+for worker in workers:
+    worker.join()
+
+for method, summary in default_profiler.snapshot().items():
+    print(f"{method:<28} count={summary['count']:<6} p50={summary['p50_seconds'] * 1e6:.2f}us "
+          f"p99={summary['p99_seconds'] * 1e6:.2f}us p999={summary['p999_seconds'] * 1e6:.2f}us")
+
+export_folder = tempfile.mkdtemp()
+default_profiler.export_json(os.path.join(export_folder, "latency.json"))
+default_profiler.export_prometheus(os.path.join(export_folder, "latency.prom"))
+with open(os.path.join(export_folder, "latency.prom")) as prom:
+    print(prom.read().splitlines()[1])  # method_latency_seconds{method="ProfiledCalculator.add",quantile="0.5"} 0.000000...
@@ -127,6 +127,729 @@ print(fibonacci.cache_info())  # Example output: CacheInfo(hits=49, misses=51, m
 fibonacci.cache_clear()        # Clears the cache
 
 
+#Example: Fast-doubling Fibonacci, no recursion and no cache needed
+"""fibonacci() above recurses n levels deep (RecursionError for n in the high hundreds) and only keeps 32 results.
+Fast doubling uses F(2k) = F(k) * (2*F(k+1) - F(k)) and F(2k+1) = F(k)**2 + F(k+1)**2,
+so F(n) takes O(log n) big-integer steps and works for n in the millions."""
+
+def _fib_pair(n):
+    """Return (F(n), F(n+1)) by walking the bits of n from the most significant one"""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)   # F(2k)
+        d = a * a + b * b     # F(2k+1)
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+FIB_TABLE = [0, 1]  # precomputed F(0)..F(255) for the common small-n calls
+while len(FIB_TABLE) < 256:
+    FIB_TABLE.append(FIB_TABLE[-1] + FIB_TABLE[-2])
+
+def fib(n):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if n < len(FIB_TABLE):
+        return FIB_TABLE[n]
+    return _fib_pair(n)[0]
+
+def fib_many(ns):
+    """F(n) for every n in ns from one shared walk over the sorted n values.
+    Stepping from (F(m), F(m+1)) by a gap d uses the addition formulas
+    F(m+d) = F(m)F(d+1) + F(m+1)F(d) - F(m)F(d) and F(m+d+1) = F(m+1)F(d+1) + F(m)F(d)."""
+    results = {}
+    m, (a, b) = 0, (0, 1)
+    for n in sorted(set(ns)):
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        fd, fd1 = _fib_pair(n - m)
+        a, b = a * fd1 + b * fd - a * fd, b * fd1 + a * fd
+        m = n
+        results[n] = a
+    return [results[n] for n in ns]
+
+print(fib(50))                   # 12586269025
+print(fib_many([10, 3, 50, 10])) # [55, 2, 12586269025, 55]
+print(fib(1_000_000).bit_length())  # 694241 bits
+
+# Benchmark against the lru_cache version and the generator (same as infinite_fibonacci in Generator/generator.py)
+import timeit
+
+def infinite_fibonacci():
+    a, b = 0, 1
+    while True:
+        yield a
+        a, b = b, a + b
+
+def nth_from_generator(n):
+    gen = infinite_fibonacci()
+    for _ in range(n):
+        next(gen)
+    return next(gen)
+
+def cold_lru_fibonacci(n):
+    fibonacci.cache_clear()
+    return fibonacci(n)
+
+for n in (300, 100_000, 1_000_000):
+    line = f"n={n:<9} fast doubling={timeit.timeit(lambda: fib(n), number=1):.5f}s"
+    if n <= 300:  # deeper recursion hits the recursion limit
+        line += f" lru_cache(cold)={timeit.timeit(lambda: cold_lru_fibonacci(n), number=1):.5f}s"
+    if n <= 100_000:
+        line += f" generator={timeit.timeit(lambda: nth_from_generator(n), number=1):.5f}s"
+    print(line)
+
+batch = list(range(100_000, 101_000))
+print(f"1000 values near 100000: fib_many={timeit.timeit(lambda: fib_many(batch), number=1):.4f}s "
+      f"separate fib calls={timeit.timeit(lambda: [fib(n) for n in batch], number=1):.4f}s")
+fibonacci.cache_clear()
+
+
+#Example: persistent_cache, an lru_cache that survives restarts
+"""Results are pickled into a local sqlite3 file, so a restarted worker starts warm.
+sqlite's own file locking (WAL mode) makes one cache file safe to share between processes.
+Entries older than `ttl` seconds are ignored and removed, and once the file holds more than
+`maxbytes` of pickled values the least recently used entries are evicted."""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+
+PersistentCacheInfo = namedtuple("PersistentCacheInfo", ["hits", "misses", "maxbytes", "currsize", "currbytes"])
+
+def persistent_cache(path, maxbytes=64 * 1024 * 1024, ttl=None):
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        local = threading.local()  # sqlite3 connections must not cross threads or forks
+        stats = {"hits": 0, "misses": 0}
+
+        def connection():
+            conn = getattr(local, "conn", None)
+            if conn is None or local.pid != os.getpid():
+                conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS cache (func TEXT, key BLOB, value BLOB, size INTEGER,"
+                             " created REAL, accessed REAL, PRIMARY KEY (func, key))")
+                conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+                local.conn, local.pid = conn, os.getpid()
+            return conn
+
+        def evict(conn, now):
+            if ttl is not None:
+                conn.execute("DELETE FROM cache WHERE created < ?", (now - ttl,))
+            excess = conn.execute("SELECT total(size) FROM cache").fetchone()[0] - maxbytes
+            if excess > 0:
+                victims = []
+                for func_name, key, size in conn.execute("SELECT func, key, size FROM cache ORDER BY accessed"):
+                    victims.append((func_name, key))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM cache WHERE func = ? AND key = ?", victims)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            conn = connection()
+            key = pickle.dumps((args, sorted(kwargs.items())))
+            now = time.time()
+            row = conn.execute("SELECT value, created, accessed FROM cache WHERE func = ? AND key = ?",
+                               (name, key)).fetchone()
+            if row is not None and (ttl is None or now - row[1] <= ttl):
+                stats["hits"] += 1
+                if now - row[2] > 1.0:  # refresh the LRU stamp at most once a second to keep hits read-only
+                    conn.execute("UPDATE cache SET accessed = ? WHERE func = ? AND key = ?", (now, name, key))
+                return pickle.loads(row[0])
+            stats["misses"] += 1
+            result = func(*args, **kwargs)
+            value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(value) > maxbytes:  # could never fit, storing it would only flush the rest of the cache
+                return result
+            with conn:  # one transaction so other processes never see a half-evicted cache
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                             (name, key, value, len(value), now, now))
+                evict(conn, now)
+            return result
+
+        def cache_info():
+            count, size = connection().execute(
+                "SELECT count(*), total(size) FROM cache WHERE func = ?", (name,)).fetchone()
+            return PersistentCacheInfo(stats["hits"], stats["misses"], maxbytes, count, int(size))
+
+        def cache_clear():
+            connection().execute("DELETE FROM cache WHERE func = ?", (name,))
+            stats["hits"] = stats["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+cache_path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+
+@persistent_cache(cache_path, maxbytes=1024 * 1024, ttl=3600)
+def slow_square(n):
+    time.sleep(0.1)  # stands in for an expensive computation
+    return n * n
+
+start = time.perf_counter()
+print(slow_square(12))                                            # 144, computed
+print(f"miss took {time.perf_counter() - start:.4f}s")
+start = time.perf_counter()
+print(slow_square(12))                                            # 144, read from disk
+print(f"hit took  {time.perf_counter() - start:.4f}s")
+print(slow_square.cache_info())  # PersistentCacheInfo(hits=1, misses=1, maxbytes=1048576, currsize=1, currbytes=...)
+
+# A "restarted worker": a fresh function object on the same file starts with a warm cache
+@persistent_cache(cache_path, maxbytes=1024 * 1024, ttl=3600)
+def slow_square(n):
+    time.sleep(0.1)
+    return n * n
+
+print(slow_square(12), slow_square.cache_info().hits)              # 144 1
+slow_square.cache_clear()
+
+
+#Example: single_flight_cache, memoization that computes a cold key only once under concurrency
+"""With lru_cache every thread that misses on the same cold key runs the function itself.
+Here the first caller computes while the others wait on its future (sync). For async def the computation
+runs as its own task that every caller awaits, so cancelling the first caller does not fail the others.
+cache_info() also reports latency histograms for hits, misses and in-flight waits plus evictions."""
+
+import asyncio
+import bisect
+import inspect
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class LatencyHistogram:
+    """Counts samples in power-of-two microsecond buckets: <1us, <2us, <4us, ... <2**30us"""
+    BOUNDS = [2 ** i / 1e6 for i in range(31)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_right(self.BOUNDS, seconds)] += 1
+        self.total += seconds
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile"""
+        target, seen = p / 100 * self.count, 0
+        for bound, count in zip(self.BOUNDS + [float("inf")], self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return 0.0
+
+    def __repr__(self):
+        if not self.count:
+            return "LatencyHistogram(count=0)"
+        return (f"LatencyHistogram(count={self.count}, mean={self.total / self.count * 1e6:.1f}us, "
+                f"p50<={self.percentile(50) * 1e6:.0f}us, p99<={self.percentile(99) * 1e6:.0f}us)")
+
+SingleFlightInfo = namedtuple("SingleFlightInfo", ["hits", "misses", "waits", "evictions", "maxsize", "currsize",
+                                                   "hit_latency", "miss_latency", "wait_latency"])
+
+def single_flight_cache(maxsize=128):
+    def decorator(func):
+        cache = OrderedDict()
+        in_flight = {}
+        lock = threading.Lock()
+        histograms = {"hit": LatencyHistogram(), "miss": LatencyHistogram(), "wait": LatencyHistogram()}
+        evictions = [0]
+
+        def make_key(args, kwargs):
+            return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+        def store(key, value):
+            with lock:
+                cache[key] = value
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    evictions[0] += 1
+
+        def record(name, start):
+            with lock:  # counts[i] += 1 is not atomic, concurrent records could lose samples
+                histograms[name].record(time.perf_counter() - start)
+
+        def lookup(key):
+            """Return ("hit", value), ("wait", future) or ("lead", future); called with the lock held"""
+            if key in cache:
+                cache.move_to_end(key)
+                return "hit", cache[key]
+            if key in in_flight:
+                return "wait", in_flight[key]
+            return "lead", None
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                key = make_key(args, kwargs)
+                flight_key = (id(asyncio.get_running_loop()), key)  # asyncio tasks belong to one loop
+                with lock:
+                    state, found = lookup(key)
+                    if state == "hit":
+                        histograms["hit"].record(time.perf_counter() - start)
+                        return found
+                    task = in_flight.get(flight_key)
+                    leader = task is None
+                    if leader:
+                        # The computation is its own task: cancelling the caller that started it
+                        # (e.g. a disconnected client) does not cancel it for the other callers
+                        task = in_flight[flight_key] = asyncio.ensure_future(compute(key, flight_key, start,
+                                                                                     args, kwargs))
+                        task.add_done_callback(lambda done: done.cancelled() or done.exception())  # mark retrieved
+                try:
+                    return await asyncio.shield(task)
+                finally:
+                    if not leader:
+                        record("wait", start)
+
+            async def compute(key, flight_key, start, args, kwargs):
+                try:
+                    result = await func(*args, **kwargs)
+                    store(key, result)
+                    return result
+                finally:
+                    with lock:
+                        del in_flight[flight_key]
+                        histograms["miss"].record(time.perf_counter() - start)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                key = make_key(args, kwargs)
+                with lock:
+                    state, found = lookup(key)
+                    if state == "hit":
+                        histograms["hit"].record(time.perf_counter() - start)
+                        return found
+                    if state == "lead":
+                        found = in_flight[key] = Future()
+                if state == "wait":
+                    try:
+                        return found.result()
+                    finally:
+                        record("wait", start)
+                try:
+                    result = func(*args, **kwargs)
+                    store(key, result)
+                    found.set_result(result)
+                    return result
+                except BaseException as error:
+                    found.set_exception(error)
+                    raise
+                finally:
+                    with lock:
+                        del in_flight[key]
+                        histograms["miss"].record(time.perf_counter() - start)
+
+        def cache_info():
+            hit, miss, wait = histograms["hit"], histograms["miss"], histograms["wait"]
+            return SingleFlightInfo(hit.count, miss.count, wait.count, evictions[0], maxsize, len(cache),
+                                    hit, miss, wait)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                for name in histograms:
+                    histograms[name] = LatencyHistogram()
+                evictions[0] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+@single_flight_cache(maxsize=32)
+def load_report(report_id):
+    time.sleep(0.2)  # slow backend call
+    return f"report {report_id}"
+
+# 16 threads ask for the same cold key: one computes, 15 wait for its result
+with ThreadPoolExecutor(max_workers=16) as pool:
+    print(set(pool.map(load_report, [7] * 16)))   # {'report 7'}
+load_report(7)
+info = load_report.cache_info()
+print(info.hits, info.misses, info.waits)        # 1 1 15
+print(info.wait_latency)
+
+@single_flight_cache(maxsize=32)
+async def fetch_user(user_id):
+    await asyncio.sleep(0.1)
+    return {"id": user_id}
+
+async def main():
+    return await asyncio.gather(*(fetch_user(1) for _ in range(10)))
+
+print(len(asyncio.run(main())), fetch_user.cache_info().misses)  # 10 1
+
+
+#Example: policy_cache, caching decorator with pluggable eviction policies (LRU, LFU, ARC, W-TinyLFU)
+"""Pure LRU lets one scan over cold keys flush the hot set. The policies below share one small
+interface (get / put / __len__, put replaces a key that is already stored) and are picked by name, like plugins. `maxweight` is the capacity;
+`weigh(result)` gives an entry's cost or size, by default every entry weighs 1.
+  lru       - evict the least recently used entry
+  lfu       - evict the least frequently used entry (ties: least recently used), O(1) frequency buckets
+  arc       - Adaptive Replacement Cache: balances a recency list and a frequency list using ghost
+              lists of recently evicted keys
+  tinylfu   - W-TinyLFU: small LRU window + segmented LRU main area; an entry leaving the window only
+              enters main if a count-min sketch says it is used more often than main's victim"""
+
+import random
+from array import array
+
+_MISSING = object()
+
+class LRUPolicy:
+    def __init__(self, maxweight):
+        self.maxweight = maxweight
+        self.entries = OrderedDict()  # key -> (value, weight)
+        self.weight = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, weight=1):
+        old = self.entries.pop(key, None)  # two threads that missed the same key both call put
+        if old is not None:
+            self.weight -= old[1]
+        if weight > self.maxweight:
+            return
+        self.weight += weight
+        self.entries[key] = (value, weight)
+        while self.weight > self.maxweight:
+            _, (_, evicted_weight) = self.entries.popitem(last=False)
+            self.weight -= evicted_weight
+            self.evictions += 1
+
+
+class LFUPolicy:
+    def __init__(self, maxweight):
+        self.maxweight = maxweight
+        self.entries = {}   # key -> [value, weight, frequency]
+        self.buckets = {}   # frequency -> OrderedDict of keys, oldest first
+        self.min_frequency = 0
+        self.weight = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _bump(self, key, entry):
+        frequency = entry[2]
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        entry[2] = frequency + 1
+        self.buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        self._bump(key, entry)
+        return entry[0]
+
+    def _remove(self, key):
+        value, weight, frequency = self.entries.pop(key)
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = min(self.buckets, default=0)
+        self.weight -= weight
+
+    def put(self, key, value, weight=1):
+        if key in self.entries:
+            self._remove(key)
+        if weight > self.maxweight:
+            return
+        while self.weight + weight > self.maxweight:
+            bucket = self.buckets[self.min_frequency]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_frequency]
+                self.min_frequency = min(self.buckets, default=0)
+            self.weight -= self.entries.pop(victim)[1]
+            self.evictions += 1
+        self.entries[key] = [value, weight, 1]
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+        self.weight += weight
+
+
+class ARCPolicy:
+    """ARC (Megiddo & Modha) with list sizes measured in weight instead of entry count"""
+
+    def __init__(self, maxweight):
+        self.maxweight = maxweight
+        self.t1, self.t2 = OrderedDict(), OrderedDict()  # cached: key -> (value, weight)
+        self.b1, self.b2 = OrderedDict(), OrderedDict()  # ghosts: key -> weight
+        self.w = {"t1": 0, "t2": 0, "b1": 0, "b2": 0}
+        self.target = 0  # adaptive target weight for t1
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+    def get(self, key):
+        if key in self.t1:
+            value, weight = self.t1.pop(key)
+            self.w["t1"] -= weight
+            self.t2[key] = (value, weight)
+            self.w["t2"] += weight
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key][0]
+        return _MISSING
+
+    def _replace(self, in_b2):
+        """Move the LRU entry of t1 or t2 to its ghost list"""
+        if self.t1 and (self.w["t1"] > self.target or (in_b2 and self.w["t1"] == self.target) or not self.t2):
+            key, (_, weight) = self.t1.popitem(last=False)
+            self.w["t1"] -= weight
+            self.b1[key] = weight
+            self.w["b1"] += weight
+        else:
+            key, (_, weight) = self.t2.popitem(last=False)
+            self.w["t2"] -= weight
+            self.b2[key] = weight
+            self.w["b2"] += weight
+        self.evictions += 1
+
+    def put(self, key, value, weight=1):
+        for name in ("t1", "t2"):  # already cached: replace the entry, it counts as a repeat use
+            if key in getattr(self, name):
+                self.w[name] -= getattr(self, name).pop(key)[1]
+                if weight <= self.maxweight:
+                    self.t2[key] = (value, weight)
+                    self.w["t2"] += weight
+                    while self.w["t1"] + self.w["t2"] > self.maxweight:
+                        self._replace(False)
+                return
+        if weight > self.maxweight:
+            return
+        in_b2 = key in self.b2  # REPLACE's "x in B2 and |T1| == p" rule applies to real B2 hits only
+        if key in self.b1:
+            self.target = min(self.maxweight, self.target + max(self.w["b2"] / self.w["b1"], 1) * weight)
+            self.w["b1"] -= self.b1.pop(key)
+            lists = "t2"
+        elif in_b2:
+            self.target = max(0, self.target - max(self.w["b1"] / self.w["b2"], 1) * weight)
+            self.w["b2"] -= self.b2.pop(key)
+            lists = "t2"
+        else:
+            lists = "t1"
+        while self.w["t1"] + self.w["t2"] + weight > self.maxweight:
+            self._replace(in_b2)
+        getattr(self, lists)[key] = (value, weight)
+        self.w[lists] += weight
+        # Ghost lists remember at most one cache worth of keys each side
+        while self.b1 and self.w["t1"] + self.w["b1"] > self.maxweight:
+            self.w["b1"] -= self.b1.popitem(last=False)[1]
+        while self.b2 and sum(self.w.values()) > 2 * self.maxweight:
+            self.w["b2"] -= self.b2.popitem(last=False)[1]
+
+
+class CountMinSketch:
+    """4-row count-min sketch of small saturating counters; halves every counter after
+    `sample_size` increments so old popularity fades"""
+
+    def __init__(self, capacity):
+        self.width = 1 << max(4, (4 * capacity - 1).bit_length())
+        self.mask = self.width - 1
+        self.rows = [array("B", bytes(self.width)) for _ in range(4)]
+        self.sample_size = 10 * capacity
+        self.additions = 0
+
+    def _slots(self, key):
+        # Double hashing: row i uses h1 + i * h2, so one hash() call serves all four rows
+        h1 = hash(key)
+        h2 = ((h1 * 0x9E3779B1) >> 16) | 1
+        mask = self.mask
+        return (h1 & mask, (h1 + h2) & mask, (h1 + 2 * h2) & mask, (h1 + 3 * h2) & mask)
+
+    def increment(self, key):
+        for row, slot in zip(self.rows, self._slots(key)):
+            if row[slot] < 15:
+                row[slot] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            for index, row in enumerate(self.rows):
+                self.rows[index] = array("B", bytes(count >> 1 for count in row))
+            self.additions //= 2
+
+    def frequency(self, key):
+        return min(row[slot] for row, slot in zip(self.rows, self._slots(key)))
+
+
+class TinyLFUPolicy:
+    def __init__(self, maxweight, window_fraction=0.01, protected_fraction=0.8):
+        self.maxweight = maxweight
+        self.window_max = max(1, int(maxweight * window_fraction))
+        self.main_max = maxweight - self.window_max
+        self.protected_max = int(self.main_max * protected_fraction)
+        self.window, self.probation, self.protected = OrderedDict(), OrderedDict(), OrderedDict()
+        self.w = {"window": 0, "probation": 0, "protected": 0}
+        self.sketch = CountMinSketch(maxweight)
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def _move(self, key, source, target):
+        entry = getattr(self, source).pop(key)
+        self.w[source] -= entry[1]
+        getattr(self, target)[key] = entry
+        self.w[target] += entry[1]
+
+    def get(self, key):
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key][0]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key][0]
+        if key in self.probation:
+            # Second hit promotes to protected, protected overflow falls back to probation
+            self._move(key, "probation", "protected")
+            while self.w["protected"] > self.protected_max:
+                self._move(next(iter(self.protected)), "protected", "probation")
+            return self.protected[key][0]
+        return _MISSING
+
+    def put(self, key, value, weight=1):
+        for segment in ("window", "probation", "protected"):
+            if key in getattr(self, segment):
+                self.w[segment] -= getattr(self, segment).pop(key)[1]
+        if weight > self.maxweight:
+            return
+        self.window[key] = (value, weight)
+        self.w["window"] += weight
+        while self.w["window"] > self.window_max:
+            candidate = next(iter(self.window))
+            self._move(candidate, "window", "probation")
+            # Admission: the candidate has to beat main's victims or it is dropped
+            while self.w["probation"] + self.w["protected"] > self.main_max:
+                victim = next(iter(self.probation))  # probation LRU, the candidate itself if it is alone
+                if victim != candidate and self.sketch.frequency(candidate) <= self.sketch.frequency(victim):
+                    victim = candidate
+                self.w["probation"] -= self.probation.pop(victim)[1]
+                self.evictions += 1
+                if victim == candidate:
+                    break
+
+
+EVICTION_POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy, "arc": ARCPolicy, "tinylfu": TinyLFUPolicy}
+
+PolicyCacheInfo = namedtuple("PolicyCacheInfo", ["hits", "misses", "evictions", "maxweight", "currsize"])
+
+def policy_cache(policy="lru", maxweight=128, weigh=None):
+    """policy is a name from EVICTION_POLICIES or any class taking maxweight with get/put/__len__"""
+    policy_class = EVICTION_POLICIES[policy] if isinstance(policy, str) else policy
+
+    def decorator(func):
+        state = {"policy": policy_class(maxweight), "hits": 0, "misses": 0}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            with lock:
+                value = state["policy"].get(key)
+                if value is not _MISSING:
+                    state["hits"] += 1
+                    return value
+                state["misses"] += 1
+            value = func(*args, **kwargs)
+            with lock:
+                state["policy"].put(key, value, weigh(value) if weigh else 1)
+            return value
+
+        def cache_info():
+            current = state["policy"]
+            return PolicyCacheInfo(state["hits"], state["misses"], current.evictions, maxweight, len(current))
+
+        def cache_clear():
+            with lock:
+                state.update(policy=policy_class(maxweight), hits=0, misses=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+@policy_cache("tinylfu", maxweight=1000, weigh=len)  # weight = length of the cached string
+def render_page(page_id):
+    return f"<html>{page_id}</html>" * 3
+
+render_page(1)
+render_page(1)
+print(render_page.cache_info())  # PolicyCacheInfo(hits=1, misses=1, evictions=0, maxweight=1000, currsize=1)
+
+# Replay benchmark: recorded key traces through each policy, hit ratio and cost per operation
+def replay(policy_class, trace, maxweight):
+    cache = policy_class(maxweight)
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is _MISSING:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace), (time.perf_counter() - start) / len(trace)
+
+def zipf_trace(length, keys, skew=1.0, seed=0):
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, keys + 1)]
+    return rng.choices(range(keys), weights=weights, k=length)
+
+def zipf_with_scans(length, keys, scan_every=20_000, scan_length=5_000, seed=0):
+    """Skewed traffic interrupted by sequential scans over keys that are never reused"""
+    trace, scan_key = [], keys
+    for start in range(0, length, scan_every):
+        trace += zipf_trace(scan_every, keys, seed=seed + start)
+        trace += range(scan_key, scan_key + scan_length)
+        scan_key += scan_length
+    return trace[:length]
+
+traces = {"zipf": zipf_trace(200_000, 50_000), "zipf+scans": zipf_with_scans(200_000, 50_000)}
+for trace_name, trace in traces.items():
+    for policy_name, policy_class in EVICTION_POLICIES.items():
+        hit_ratio, per_op = replay(policy_class, trace, maxweight=2_000)
+        print(f"{trace_name:<11} {policy_name:<8} hit ratio={hit_ratio:.3f} cost={per_op * 1e9:.0f} ns/op")
+
+
 #Example: @dataclass
 
 from dataclasses import dataclass
@@ -287,12 +1010,19 @@ with open_file("example.txt", "w") as f:
 
 #Example: Singleton class
 
+import threading
+
 def singleton(cls):
     instances = {}
+    lock = threading.Lock()
     def get_instance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+        instance = instances.get(cls)  # lock-free once created
+        if instance is None:
+            with lock:  # double-checked: only one thread may build the instance
+                instance = instances.get(cls)
+                if instance is None:
+                    instance = instances[cls] = cls(*args, **kwargs)
+        return instance
     return get_instance
 
 @singleton
@@ -321,6 +1051,278 @@ print(loader.data)  # Prints: Loading data... [1, 2, 3, 4, 5]
 print(loader.data)  # Uses the cached value, doesn't print "Loading data..."
 
 
+#Example: refreshable_cached_property, cached_property with TTL, invalidation and background refresh
+"""functools.cached_property computes once and never expires, and every thread reading it during
+the first load blocks. refreshable_cached_property(ttl=...) loads once per instance (other threads
+wait for that one load), then serves the value lock-free. After `ttl` seconds the next read still
+returns the stale value immediately and starts one background reload (stale-while-revalidate).
+`del obj.attr` invalidates it; ClassName.attr.refresh(obj) reloads it in the caller's thread."""
+
+class _PropertyState:
+    __slots__ = ("value", "loaded_at", "refreshing", "lock", "task")
+
+    def __init__(self):
+        self.value = _MISSING
+        self.loaded_at = 0.0
+        self.refreshing = False
+        self.lock = threading.Lock()
+        self.task = None  # async form: the shared load task
+
+
+class refreshable_cached_property:
+    _states_lock = threading.Lock()
+
+    def __init__(self, func=None, *, ttl=None, background=True):
+        self.func = func
+        self.ttl = ttl
+        self.background = background
+        if func is not None:
+            self.__doc__ = func.__doc__
+
+    def __call__(self, func):  # used as @refreshable_cached_property(ttl=...)
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner, name):
+        self.attrname = name
+        self.statename = f"_{name}_state"
+
+    def _state(self, instance):
+        state = instance.__dict__.get(self.statename)
+        if state is None:
+            with self._states_lock:
+                state = instance.__dict__.setdefault(self.statename, _PropertyState())
+        return state
+
+    def _expired(self, state):
+        return self.ttl is not None and time.monotonic() - state.loaded_at > self.ttl
+
+    def refresh(self, instance):
+        state = self._state(instance)
+        with state.lock:
+            state.value = self.func(instance)
+            state.loaded_at = time.monotonic()
+            return state.value
+
+    def _background_refresh(self, instance, state):
+        try:
+            value = self.func(instance)
+            with state.lock:
+                state.value, state.loaded_at = value, time.monotonic()
+        finally:
+            state.refreshing = False
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        state = self._state(instance)
+        value = state.value
+        if value is _MISSING:
+            with state.lock:  # first load: one thread computes, the rest wait here
+                if state.value is _MISSING:
+                    state.value = self.func(instance)
+                    state.loaded_at = time.monotonic()
+                return state.value
+        if self._expired(state):
+            if not self.background:
+                return self.refresh(instance)
+            with self._states_lock:
+                start = not state.refreshing
+                state.refreshing = True
+            if start:
+                threading.Thread(target=self._background_refresh, args=(instance, state), daemon=True).start()
+        return value
+
+    def __delete__(self, instance):
+        state = self._state(instance)
+        with state.lock:
+            state.value = _MISSING
+
+
+class async_cached_property(refreshable_cached_property):
+    """Same rules for an `async def` loader: `await obj.attr`. Coroutines reading it during the
+    first load all await the one shared task; expired values are returned while a task reloads."""
+
+    async def _load(self, instance, state):
+        value = await self.func(instance)
+        state.value, state.loaded_at = value, time.monotonic()
+        return value
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self._get(instance)
+
+    async def _get(self, instance):
+        state = self._state(instance)
+        if state.value is _MISSING:
+            if state.task is None or state.task.done():
+                state.task = asyncio.ensure_future(self._load(instance, state))
+            return await asyncio.shield(state.task)
+        if self._expired(state) and (state.task is None or state.task.done()):
+            state.task = asyncio.ensure_future(self._load(instance, state))
+            if not self.background:
+                return await asyncio.shield(state.task)
+        return state.value
+
+    def __delete__(self, instance):
+        state = self._state(instance)
+        state.value, state.task = _MISSING, None
+
+
+class DataLoader:
+    loads = 0
+
+    @refreshable_cached_property(ttl=0.2)
+    def data(self):
+        DataLoader.loads += 1
+        time.sleep(0.1)  # slow load
+        return [1, 2, 3, 4, 5, DataLoader.loads]
+
+loader = DataLoader()
+with ThreadPoolExecutor(max_workers=8) as pool:
+    print(list(pool.map(lambda _: loader.data, range(8)))[0])  # [1, 2, 3, 4, 5, 1], loaded once
+time.sleep(0.3)
+print(loader.data)     # [1, 2, 3, 4, 5, 1], stale value returned at once, reload starts in background
+time.sleep(0.2)
+print(loader.data)     # [1, 2, 3, 4, 5, 2], refreshed value
+del loader.data        # invalidate, next read loads again
+print(loader.data)     # [1, 2, 3, 4, 5, 3]
+
+class AsyncDataLoader:
+    loads = 0
+
+    @async_cached_property(ttl=60)
+    async def data(self):
+        AsyncDataLoader.loads += 1
+        await asyncio.sleep(0.1)
+        return [1, 2, 3, 4, 5]
+
+async def read_many(async_loader):
+    return await asyncio.gather(*(async_loader.data for _ in range(10)))
+
+async_loader = AsyncDataLoader()
+print(len(asyncio.run(read_many(async_loader))), AsyncDataLoader.loads)  # 10 1
+
+
+#Example: cached_method, per-instance memoization that does not pin instances
+"""@lru_cache on a method keys its one global cache on `self`: every instance stays alive as long as
+the cache holds an entry for it, and all instances compete for one maxsize. cached_method keeps a
+separate LRU cache per instance, in a table on the descriptor keyed by id(instance). A weakref.finalize
+callback drops the entry when the instance dies, so the class must support weak references. Nothing is
+written into the instance, so copies get their own cache and pickling is unaffected."""
+
+import gc
+import weakref
+from functools import update_wrapper
+from types import MethodType
+
+MethodCacheInfo = namedtuple("MethodCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class CachedMethod:
+    def __init__(self, func, maxsize=128):
+        self.func = func
+        self.maxsize = maxsize
+        self.caches = {}  # id(instance) -> that instance's cached function
+        self.lock = threading.Lock()  # two threads touching a new instance must not build two caches
+        update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self  # Class.method(obj, ...) goes through __call__ below
+        cached = self.caches.get(id(instance))
+        if cached is None:
+            with self.lock:
+                cached = self.caches.get(id(instance))
+                if cached is None:
+                    cached = self.caches[id(instance)] = _make_cached_function(self.func, self.maxsize)
+                    # Runs before the id can be reused by another object
+                    weakref.finalize(instance, self.caches.pop, id(instance), None)
+        # An ordinary bound method: holds `self` strongly, cache_info / cache_clear come from the function
+        return MethodType(cached, instance)
+
+    def __call__(self, instance, *args, **kwargs):
+        return self.__get__(instance)(*args, **kwargs)
+
+def cached_method(func=None, *, maxsize=128):
+    """Use as @cached_method or @cached_method(maxsize=...)"""
+    if func is None:
+        return lambda func: CachedMethod(func, maxsize)
+    return CachedMethod(func, maxsize)
+
+def _make_cached_function(func, maxsize):
+    cache = OrderedDict()
+    stats = {"hits": 0, "misses": 0}
+    lock = threading.Lock()  # held for lookups and stores only, never while func runs
+
+    # Takes the instance as an argument instead of closing over it, so the cache never keeps it alive
+    @wraps(func)
+    def cached(instance, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                stats["hits"] += 1
+                return cache[key]
+            stats["misses"] += 1
+        result = func(instance, *args, **kwargs)
+        with lock:
+            cache[key] = result
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+        return result
+
+    def cache_info():
+        with lock:
+            return MethodCacheInfo(stats["hits"], stats["misses"], maxsize, len(cache))
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+            stats.update(hits=0, misses=0)
+
+    cached.cache_info = cache_info
+    cached.cache_clear = cache_clear
+    return cached
+
+
+@dataclass(order=True)
+class Item:
+    name: str
+    quantity: int = 0
+    price: float = 0.0
+
+    @cached_method(maxsize=16)
+    def discounted_value(self, discount):
+        return self.quantity * self.price * (1 - discount)
+
+laptop = Item("Laptop", quantity=50, price=2.99)
+print(laptop.discounted_value(0.1))  # computed
+print(laptop.discounted_value(0.1))  # from laptop's own cache
+print(laptop.discounted_value.cache_info())  # MethodCacheInfo(hits=1, misses=1, maxsize=16, currsize=1)
+
+# The instance is freed as soon as the last reference goes, its cache with it
+watcher = weakref.ref(laptop)
+del laptop
+print(watcher() is None)  # True
+
+# Compare: lru_cache on a method keeps every instance alive until it is evicted from the shared cache
+class PinnedItem:
+    @lru_cache(maxsize=16)
+    def value(self):
+        return 42
+
+pinned = PinnedItem()
+pinned.value()
+watcher = weakref.ref(pinned)
+del pinned
+gc.collect()
+print(watcher() is None)  # False, the lru_cache still holds `self`
+PinnedItem.value.cache_clear()
+
+
 
 #Example: total_ordering, need  __eq__ and atleast one(>,<,>=,<=) to auto-generate rest operators.
 
@@ -389,6 +1391,111 @@ class Animal:
 #TypeError: Instance and class checks can only be used with @runtime_checkable protocols
 
 
+#Example: ProtocolChecker, cached runtime protocol checks
+"""isinstance(obj, Greetable) inspects every protocol member on every call. A ProtocolChecker
+checks a concrete type once and remembers the answer per type. Classes built with
+ConformanceMeta drop those cached answers whenever they are changed (attribute set or deleted),
+and can declare implements=(Protocol, ...) to be checked once at class creation - like
+InterfaceMeta in meta_class.py, but looking through base classes too, not only the class's own dict.
+Members declared only as annotations (data attributes) may be set in __init__, so those are still
+checked on the instance."""
+
+# Bookkeeping attributes every class or Protocol carries; anything else, dunders like __len__ included,
+# is a protocol member (the same list typing uses for isinstance checks)
+_PROTOCOL_SPECIAL_ATTRIBUTES = frozenset({
+    "__abstractmethods__", "__annotations__", "__callable_proto_members_only__", "__class_getitem__",
+    "__dict__", "__doc__", "__final__", "__firstlineno__", "__init__", "__module__", "__new__",
+    "__non_callable_proto_members__", "__orig_bases__", "__orig_class__", "__parameters__",
+    "__protocol_attrs__", "__qualname__", "__slots__", "__static_attributes__", "__subclasshook__",
+    "__type_params__", "__weakref__", "_is_protocol", "_is_runtime_protocol", "_MutableMapping__marker",
+})
+
+class ProtocolChecker:
+    _all = weakref.WeakSet()  # every checker, so a modified class can be invalidated everywhere
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.methods, self.data = set(), set()
+        for base in protocol.__mro__:
+            if base in (object, Protocol) or not getattr(base, "_is_protocol", False):
+                continue
+            for name, value in vars(base).items():
+                if name not in _PROTOCOL_SPECIAL_ATTRIBUTES and not name.startswith("_abc_"):
+                    self.methods.add(name)
+            self.data.update(name for name in getattr(base, "__annotations__", {}) if name not in self.methods)
+        self._cache = {}  # {id(type): (weakref to type, conforms)}
+        ProtocolChecker._all.add(self)
+
+    def conforms_type(self, cls):
+        entry = self._cache.get(id(cls))
+        if entry is not None and entry[0]() is cls:
+            return entry[1]
+        conforms = all(getattr(cls, name, None) is not None for name in self.methods)
+        key = id(cls)
+        self._cache[key] = (weakref.ref(cls, lambda _, cache=self._cache: cache.pop(key, None)), conforms)
+        return conforms
+
+    def __call__(self, obj):
+        if not self.conforms_type(type(obj)):
+            return False
+        return all(hasattr(obj, name) for name in self.data) if self.data else True
+
+    def invalidate(self, cls=None):
+        if cls is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id(cls), None)
+
+    @classmethod
+    def invalidate_everywhere(cls, changed_class):
+        stack = [changed_class]  # subclasses inherit the change
+        while stack:
+            current = stack.pop()
+            for checker in cls._all:
+                checker.invalidate(current)
+            stack.extend(current.__subclasses__())
+
+
+class ConformanceMeta(type):
+    def __new__(mcs, name, bases, dct, implements=()):
+        new_class = super().__new__(mcs, name, bases, dct)
+        for protocol in implements:
+            checker = ProtocolChecker(protocol)
+            missing = sorted(member for member in checker.methods if getattr(new_class, member, None) is None)
+            if missing:
+                raise TypeError(f"{name} must implement {', '.join(missing)} of {protocol.__name__}")
+        return new_class
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        ProtocolChecker.invalidate_everywhere(cls)
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        ProtocolChecker.invalidate_everywhere(cls)
+
+
+is_greetable = ProtocolChecker(Greetable)
+print(is_greetable(alice), is_greetable(buddy), is_greetable(42))  # True True False
+
+class Robot(metaclass=ConformanceMeta, implements=(Greetable,)):
+    def greet(self) -> str:
+        return "Beep!"
+
+robot = Robot()
+print(is_greetable(robot))  # True
+del Robot.greet             # class modified: cached answer dropped
+print(is_greetable(robot))  # False
+
+# class Mute(metaclass=ConformanceMeta, implements=(Greetable,)):  # TypeError: Mute must implement greet of Greetable
+#     pass
+
+import timeit
+print("typing isinstance :", timeit.timeit(lambda: isinstance(alice, Greetable), number=200_000), "sec")
+print("ProtocolChecker   :", timeit.timeit(lambda: is_greetable(alice), number=200_000), "sec")
+print("nominal isinstance:", timeit.timeit(lambda: isinstance(alice, Person), number=200_000), "sec")
+
+
 
 # Example: @dataclass field
 # Default Values
@@ -497,6 +1604,114 @@ def say_hello():
 
 say_hello()  # Prints "Hello" three times
 
+# Example: parallel_repeat, run repetitions concurrently and keep every result
+"""repeat(n) runs the calls one after another and drops their results. parallel_repeat(n) runs them on
+a thread pool ("thread", for I/O), a process pool ("process", for CPU-bound work across cores) or as
+asyncio tasks when the function is `async def`. At most max_workers repetitions run at once. The
+call returns one RepeatResult per repetition, in order, with the value or the exception and the time
+that run took. Process workers find the function by module and name, so "process" needs a module-level
+function."""
+
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+RepeatResult = namedtuple("RepeatResult", ["index", "value", "exception", "seconds"])
+
+def _timed_call(func, args, kwargs):
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs), None, time.perf_counter() - started
+    except Exception as error:
+        return None, error, time.perf_counter() - started
+
+def _timed_call_by_name(module_name, qualname, args, kwargs):
+    """Process workers look the function up by name: the module attribute is the decorated wrapper,
+    so the undecorated function is reached through __wrapped__"""
+    try:
+        target = sys.modules[module_name]
+        for part in qualname.split("."):
+            target = getattr(target, part)
+        func = target.__wrapped__
+    except (KeyError, AttributeError) as error:  # e.g. the name was rebound to something else
+        lookup_error = LookupError(f"cannot find the parallel_repeat function {module_name}.{qualname}"
+                                   f" in the worker process: {error!r}")
+        return None, lookup_error, 0.0
+    return _timed_call(func, args, kwargs)
+
+def parallel_repeat(n, executor="thread", max_workers=None):
+    if executor not in ("thread", "process"):
+        raise ValueError("executor must be 'thread' or 'process'")
+    workers = max_workers or (os.cpu_count() if executor == "process" else 32)
+
+    def decorator(func):
+        if executor == "process" and "<locals>" in func.__qualname__:
+            raise ValueError(f"executor='process' needs a module-level function, workers cannot import "
+                             f"{func.__qualname__}")
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                limit = asyncio.Semaphore(workers)
+
+                async def run(index):
+                    async with limit:
+                        started = time.perf_counter()
+                        try:
+                            value = await func(*args, **kwargs)
+                            return RepeatResult(index, value, None, time.perf_counter() - started)
+                        except Exception as error:
+                            return RepeatResult(index, None, error, time.perf_counter() - started)
+
+                return list(await asyncio.gather(*(run(index) for index in range(n))))
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if executor == "thread":
+                pool = ThreadPoolExecutor(max_workers=workers)
+                submit = lambda: pool.submit(_timed_call, func, args, kwargs)
+            else:
+                # fork keeps __main__ importable in the workers, so scripts like this one work too
+                context = multiprocessing.get_context("fork" if hasattr(os, "fork") else None)
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                submit = lambda: pool.submit(_timed_call_by_name, func.__module__, func.__qualname__, args, kwargs)
+            with pool:
+                futures = [submit() for _ in range(n)]
+                return [RepeatResult(index, *future.result()) for index, future in enumerate(futures)]
+        return wrapper
+    return decorator
+
+
+@parallel_repeat(8, executor="process")
+def estimate_pi(samples):
+    rng = random.Random()
+    inside = sum(rng.random() ** 2 + rng.random() ** 2 <= 1 for _ in range(samples))
+    return 4 * inside / samples
+
+runs = estimate_pi(200_000)
+print(f"pi ~ {sum(run.value for run in runs) / len(runs):.4f} from {len(runs)} runs, "
+      f"slowest run {max(run.seconds for run in runs):.2f}s")
+
+@parallel_repeat(100, executor="thread", max_workers=20)
+def flaky_request():
+    time.sleep(0.01)  # simulated network call
+    if random.random() < 0.1:
+        raise ConnectionError("timeout")
+    return 200
+
+started = time.perf_counter()
+runs = flaky_request()
+failures = [run for run in runs if run.exception is not None]
+print(f"100 requests in {time.perf_counter() - started:.2f}s, {len(failures)} failed")  # ~0.05s instead of 1s
+
+@parallel_repeat(1_000, max_workers=100)
+async def ping():
+    await asyncio.sleep(0.01)
+    return "pong"
+
+runs = asyncio.run(ping())
+print(len(runs), runs[0].value)  # 1000 pong
+
 # Example class based decorator
 class LogDecorator:
     def __init__(self, func):
@@ -535,6 +1750,119 @@ def text():
 
 print(text())  # Outputs: "<b><i>Decorated Text</i></b>"
 
+
+#Example: fuse, merge a chain of simple decorators into one generated wrapper
+"""Each layer of @bold @italic adds a Python frame and packs *args, **kwargs again. When decorators
+only run code before the call (before), look at the result (after) or replace the result (transform),
+the whole chain can be written as one straight-line wrapper. fuse(d1, d2, d3)(func) behaves like
+d1(d2(d3(func))): before hooks run outermost first, after/transform hooks innermost first.
+Plain decorators may appear in the chain too; they are applied normally between fused groups."""
+
+import inspect
+import timeit
+
+class Stage:
+    """One fusable step; also usable alone as a decorator (@Stage("transform", fn))"""
+    def __init__(self, kind, fn):
+        if kind not in ("before", "after", "transform"):
+            raise ValueError(f"unknown stage kind {kind!r}")
+        self.kind = kind
+        self.fn = fn
+        wraps(fn)(self)
+
+    def __call__(self, func):
+        return fuse(self)(func)
+
+def before(fn):
+    return Stage("before", fn)
+
+def after(fn):
+    return Stage("after", fn)
+
+def transform(fn):
+    return Stage("transform", fn)
+
+def _build_fused(func, stages):
+    # Use the function's own parameter list when it is simple, so no *args/**kwargs packing at all.
+    # Generated names carry a __fused_ prefix so parameters like `func` or `stage0` cannot shadow them
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        parameters = None
+    if parameters is not None and all(p.kind is p.POSITIONAL_OR_KEYWORD and p.default is p.empty
+                                      and not p.name.startswith("__fused_") for p in parameters):
+        params = call = ", ".join(p.name for p in parameters)
+    else:
+        params, call = "*args, **kwargs", "*args, **kwargs"
+    namespace = {"__fused_func": func}
+    lines = [f"def fused({params}):"]
+    for index, stage in enumerate(stages):  # outermost first
+        namespace[f"__fused_stage{index}"] = stage.fn
+        if stage.kind == "before":
+            lines.append(f"    __fused_stage{index}({call})")
+    lines.append(f"    __fused_result = __fused_func({call})")
+    for index in reversed(range(len(stages))):  # innermost first
+        if stages[index].kind == "after":
+            lines.append(f"    __fused_stage{index}(__fused_result)")
+        elif stages[index].kind == "transform":
+            lines.append(f"    __fused_result = __fused_stage{index}(__fused_result)")
+    lines.append("    return __fused_result")
+    exec("\n".join(lines), namespace)
+    return wraps(func)(namespace["fused"])
+
+def fuse(*decorators):
+    def decorator(func):
+        wrapped, group = func, []
+        for decorator in reversed(decorators):  # innermost first
+            if isinstance(decorator, Stage):
+                group.insert(0, decorator)
+                continue
+            if group:
+                wrapped, group = _build_fused(wrapped, group), []
+            wrapped = decorator(wrapped)
+        return _build_fused(wrapped, group) if group else wrapped
+    return decorator
+
+compose = fuse
+
+
+@transform
+def bold_stage(result):
+    return f"<b>{result}</b>"
+
+@transform
+def italic_stage(result):
+    return f"<i>{result}</i>"
+
+@fuse(bold_stage, italic_stage)
+def fused_text():
+    """fused text"""
+    return "Decorated Text"
+
+print(fused_text())                          # Outputs: "<b><i>Decorated Text</i></b>"
+print(fused_text.__name__, fused_text.__doc__)  # fused_text fused text
+
+# Call overhead against chain depth: nested wrappers vs one fused wrapper
+def passthrough(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+identity_stage = transform(lambda result: result)
+
+def cheap(a, b):
+    return a + b
+
+for depth in range(0, 7):
+    nested = cheap
+    for _ in range(depth):
+        nested = passthrough(nested)
+    fused = fuse(*[identity_stage] * depth)(cheap)
+    nested_time = timeit.timeit(lambda: nested(1, 2), number=200_000) / 200_000
+    fused_time = timeit.timeit(lambda: fused(1, 2), number=200_000) / 200_000
+    print(f"depth={depth} nested={nested_time * 1e9:.0f} ns fused={fused_time * 1e9:.0f} ns")
+
  #Example: Decorators for Class Methods and Static Methods
  
     
\ No newline at end of file
@@ -94,3 +94,217 @@ class MyClass(metaclass= AddMethodMeta):
 my_obj = MyClass()  
 # call greet() method
 print(my_obj.greet()) #Hello from MyClass
+
+
+# Example : Thread-safe, fork-aware singleton metaclass
+# SingletonMeta above checks and creates in two steps, so two threads can both see "no instance" and
+# both build one. Double-checked locking: the hot path is a single dict lookup with no lock; only the
+# first creation takes the (per-class) lock and checks again. After os.fork() the child process drops
+# the inherited instances (or calls their _after_fork() hook) so pooled resources are never shared.
+import os
+import threading
+import time
+import timeit
+
+class ThreadSafeSingletonMeta(type):
+    _instances = {}       # {class: instance}
+    _locks = {}           # {class: creation lock}
+    _locks_guard = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)  # lock-free fast path once the instance exists
+        if instance is not None:
+            return instance
+        with cls._creation_lock():
+            instance = cls._instances.get(cls)  # another thread may have won the race
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+    def _creation_lock(cls):
+        lock = cls._locks.get(cls)
+        if lock is None:
+            with cls._locks_guard:
+                lock = cls._locks.setdefault(cls, threading.Lock())
+        return lock
+
+    @classmethod
+    def _after_fork_in_child(mcs):
+        # Locks may have been held by threads that do not exist in the child, start with fresh ones
+        mcs._locks_guard = threading.Lock()
+        mcs._locks.clear()
+        for cls, instance in list(mcs._instances.items()):
+            reset = getattr(instance, "_after_fork", None)
+            if reset is not None:
+                reset()                       # instance resets itself (e.g. reopens connections)
+            else:
+                del mcs._instances[cls]       # next call builds a new instance in the child
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ThreadSafeSingletonMeta._after_fork_in_child)
+
+
+class ConnectionPool(metaclass=ThreadSafeSingletonMeta):
+    def __init__(self):
+        self.owner_pid = os.getpid()
+
+pool1 = ConnectionPool()
+pool2 = ConnectionPool()
+print(pool1 is pool2)  # True
+
+# After fork the child gets its own pool
+if hasattr(os, "fork"):
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_end, str(ConnectionPool().owner_pid).encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    child_owner = int(os.read(read_end, 32))
+    os.close(read_end)
+    os.close(write_end)
+    print(child_owner == pid, ConnectionPool().owner_pid == os.getpid())  # True True
+
+
+# Contention benchmark: 64 threads released together, each calling the class 20_000 times
+def contention_benchmark(metaclass, threads=64, calls=20_000):
+    created = []
+
+    class Service(metaclass=metaclass):
+        def __init__(self):
+            time.sleep(0.01)  # slow constructor widens the race window
+            created.append(self)
+
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(calls):
+            Service()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"{metaclass.__name__:<24} instances created={len(created):<3} {elapsed:.2f}s for {threads * calls} calls")
+
+contention_benchmark(SingletonMeta)
+contention_benchmark(ThreadSafeSingletonMeta)
+
+# Cost of the hot path once the instance exists
+print("SingletonMeta           :", timeit.timeit(singletonClass, number=1_000_000), "sec / 1M calls")
+print("ThreadSafeSingletonMeta :", timeit.timeit(ConnectionPool, number=1_000_000), "sec / 1M calls")
+
+
+# Example : Indexed, weak-referencing registry with lazy plugin discovery
+# RegistryMeta above keeps a flat list: finding a class by name or by base class scans it, and classes
+# created on the fly stay alive forever. IndexedRegistryMeta indexes classes by name and by every base
+# class, holding them only by weak reference. discover() reads plugin source files with `ast` instead of
+# importing them; a plugin module is really imported the first time one of its classes is looked up.
+import ast
+import gc
+import importlib.util
+import sys
+import tempfile
+import types
+import weakref
+
+class IndexedRegistryMeta(type):
+    _by_name = weakref.WeakValueDictionary()  # {class name: class}
+    _by_base = weakref.WeakKeyDictionary()    # {base class: WeakSet of registered subclasses}
+    _pending = {}                             # {class name: (module file, base names)} discovered, not imported
+
+    def __new__(mcs, name, bases, dct):
+        new_class = super().__new__(mcs, name, bases, dct)
+        mcs._by_name[name] = new_class
+        mcs._pending.pop(name, None)
+        for base in new_class.__mro__[1:]:
+            if isinstance(base, IndexedRegistryMeta):
+                mcs._by_base.setdefault(base, weakref.WeakSet()).add(new_class)
+        return new_class
+
+    @classmethod
+    def lookup(mcs, name):
+        found = mcs._by_name.get(name)
+        if found is None and name in mcs._pending:
+            mcs._import(mcs._pending[name][0])
+            found = mcs._by_name.get(name)
+        if found is None:
+            raise KeyError(name)
+        return found
+
+    @classmethod
+    def subclasses_of(mcs, base):
+        # Import only the pending plugins that derive (directly or through other plugins) from base
+        wanted = {base.__name__}
+        changed = True
+        while changed:
+            changed = False
+            for name, (_, base_names) in mcs._pending.items():
+                if name not in wanted and wanted & set(base_names):
+                    wanted.add(name)
+                    changed = True
+        for name in wanted - {base.__name__}:
+            if name in mcs._pending:
+                mcs._import(mcs._pending[name][0])
+        return sorted(mcs._by_base.get(base, ()), key=lambda cls: cls.__name__)
+
+    @classmethod
+    def discover(mcs, folder):
+        """Record every class defined in folder/*.py without executing any of them"""
+        for path in sorted(os.listdir(folder)):
+            if not path.endswith(".py"):
+                continue
+            path = os.path.join(folder, path)
+            with open(path) as source:
+                tree = ast.parse(source.read(), filename=path)
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef) and node.name not in mcs._by_name:
+                    base_names = [ast.unparse(base).rsplit(".", 1)[-1] for base in node.bases]
+                    mcs._pending[node.name] = (path, base_names)
+
+    @staticmethod
+    def _import(path):
+        module_name = "plugin_" + os.path.splitext(os.path.basename(path))[0]
+        if module_name in sys.modules:
+            return
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+
+class Exporter(metaclass=IndexedRegistryMeta):
+    pass
+
+class JsonExporter(Exporter):
+    pass
+
+print(IndexedRegistryMeta.lookup("JsonExporter"))       # <class '__main__.JsonExporter'>
+print(IndexedRegistryMeta.subclasses_of(Exporter))      # [<class '__main__.JsonExporter'>]
+
+# Classes created on the fly disappear from the registry once nothing uses them
+Temporary = IndexedRegistryMeta("Temporary", (Exporter,), {})
+del Temporary
+gc.collect()
+print("Temporary" in IndexedRegistryMeta._by_name)      # False
+
+# Lazy discovery: plugins import the host API from a module the application exposes
+plugin_host = types.ModuleType("plugin_host")
+plugin_host.Exporter = Exporter
+sys.modules["plugin_host"] = plugin_host
+plugin_folder = tempfile.mkdtemp()
+for index in range(200):
+    with open(os.path.join(plugin_folder, f"exporter_{index}.py"), "w") as plugin:
+        plugin.write(f"from plugin_host import Exporter\n\nclass Exporter{index}(Exporter):\n    pass\n")
+
+start = time.perf_counter()
+IndexedRegistryMeta.discover(plugin_folder)
+print(f"discovered {len(IndexedRegistryMeta._pending)} plugins in {time.perf_counter() - start:.3f}s, "
+      f"imported: {'plugin_exporter_7' in sys.modules}")  # imported: False
+print(IndexedRegistryMeta.lookup("Exporter7"), "plugin_exporter_7" in sys.modules)  # <class 'plugin_exporter_7.Exporter7'> True
+print(sum(name.startswith("plugin_exporter_") for name in sys.modules))  # 1, only the plugin that was used
@@ -67,6 +67,87 @@ my_car.sunroof = Sunroof()
 print(my_car.sunroof.open())  # Using the new component dynamically
 
 
+# Example: Interning shared components with a metaclass
+"""[Wheel(size=18) for _ in range(4)] builds four equal objects, and a fleet repeats the same Engine
+and Wheel configurations millions of times. InternMeta works like SingletonMeta (see meta_class.py)
+but keys instances on the constructor arguments: equal arguments return the one existing instance.
+Instances are held in a WeakValueDictionary, so an entry disappears once no car uses it.
+Only intern classes whose instances are treated as immutable, because every holder shares them."""
+
+import inspect
+import threading
+import tracemalloc
+import weakref
+
+class InternMeta(type):
+    def __init__(cls, name, bases, dct):
+        super().__init__(name, bases, dct)
+        cls._interned = weakref.WeakValueDictionary()  # {normalized arguments: instance}, one table per class
+        cls._by_call = weakref.WeakValueDictionary()   # {arguments exactly as passed: instance}, fast path
+        cls._intern_lock = threading.Lock()
+        cls._signature = inspect.signature(cls.__init__)
+
+    def __call__(cls, *args, **kwargs):
+        call_key = (args, tuple(kwargs.items()))
+        try:
+            instance = cls._by_call.get(call_key)
+        except TypeError:  # unhashable arguments (a list, a dict...) cannot be shared, build a private instance
+            return super().__call__(*args, **kwargs)
+        if instance is not None:
+            return instance
+        # Normalize Wheel(18) and Wheel(size=18) to the same key, defaults included;
+        # a **kwargs parameter arrives as a dict, so it is turned into sorted items
+        bound = cls._signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        parameters = cls._signature.parameters
+        key = tuple(tuple(sorted(value.items())) if parameters[name].kind is inspect.Parameter.VAR_KEYWORD
+                    else value for name, value in bound.arguments.items())[1:]
+        try:
+            hash(key)
+        except TypeError:
+            return super().__call__(*args, **kwargs)
+        with cls._intern_lock:
+            instance = cls._interned.get(key)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._interned[key] = instance
+            cls._by_call[call_key] = instance
+        return instance
+
+class InternedEngine(Engine, metaclass=InternMeta):
+    pass
+
+class InternedWheel(Wheel, metaclass=InternMeta):
+    pass
+
+print(InternedWheel(size=18) is InternedWheel(18))                 # True
+print(InternedEngine(300, "V6") is InternedEngine(horsepower=300, type="V6"))  # True
+print(InternedWheel(17) is InternedWheel(18))                      # False
+print(len(InternedWheel._interned))                                # 0, nothing holds the wheels any more
+
+# Memory of a 1M-car fleet built from 3 engine and 3 wheel configurations
+def build_fleet(cars, engine_class, wheel_class):
+    configs = [(150, "I4", 16), (300, "V6", 18), (450, "V8", 20)]
+    fleet = []
+    for i in range(cars):
+        horsepower, engine_type, size = configs[i % 3]
+        engine = engine_class(horsepower=horsepower, type=engine_type)
+        fleet.append(Car("Toyota", "Camry", engine, [wheel_class(size=size) for _ in range(4)]))
+    return fleet
+
+def fleet_memory(cars, engine_class, wheel_class):
+    tracemalloc.start()
+    fleet = build_fleet(cars, engine_class, wheel_class)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del fleet
+    return size
+
+plain = fleet_memory(1_000_000, Engine, Wheel)
+interned = fleet_memory(1_000_000, InternedEngine, InternedWheel)
+print(f"1M cars: plain={plain / 1e6:.0f} MB interned={interned / 1e6:.0f} MB saved={(plain - interned) / 1e6:.0f} MB")
+
+
 # Example: Decorator Pattern with Composition
 class GPS:
     def get_location(self):
@@ -231,19 +312,36 @@ print(service.get_data())  # Outputs: "Mocked data for testing"
 """Composition can also enable plugin-like systems where behaviors are added, removed, or modified at runtime. 
 This is particularly useful in applications that need modular or pluggable architectures."""
 
+import numpy as np
+
+# Plugins may also provide execute_batch(a_array, b_array) to handle whole numpy arrays in one call
 class AddOperation:
     def execute(self, a, b):
         return a + b
 
+    def execute_batch(self, a, b):
+        return np.add(a, b)
+
 class SubtractOperation:
     def execute(self, a, b):
         return a - b
 
+    def execute_batch(self, a, b):
+        return np.subtract(a, b)
+
 class DivisionOperation:
     def execute(self,a,b):
         if b == 0 :
             raise ZeroDivisionError("denominator can not zero")
         return a/b
+
+    def execute_batch(self, a, b):
+        # No exception for zero denominators: those elements come back masked, as do masked inputs
+        mask = (b == 0) | np.ma.getmaskarray(a) | np.ma.getmaskarray(b)
+        a, b = np.ma.getdata(a), np.ma.getdata(b)
+        result = np.divide(a, b, out=np.zeros(np.broadcast(a, b).shape, dtype=float), where=~mask)
+        return np.ma.masked_array(result, mask=mask)
+
 class Calculator:
     def __init__(self):
         self.plugins = {}  #dictionary to store {func_name_str: class_obj}
@@ -257,6 +355,19 @@ class Calculator:
             return "Operation not supported"
         return operation.execute(a, b)
 
+    def calculate_many(self, operation_name, a_array, b_array):
+        """One plugin lookup for the whole batch; uses execute_batch when the plugin has it,
+        otherwise falls back to calling execute for each pair"""
+        operation = self.plugins.get(operation_name)
+        if not operation:
+            return "Operation not supported"
+        # Keep the input dtype: forcing float would round integers above 2**53, division upcasts by itself
+        a_array, b_array = np.asarray(a_array), np.asarray(b_array)
+        execute_batch = getattr(operation, "execute_batch", None)
+        if execute_batch is not None:
+            return execute_batch(a_array, b_array)
+        return np.array([operation.execute(a, b) for a, b in zip(a_array.tolist(), b_array.tolist())])
+
 # Usage
 calculator = Calculator()
 calculator.add_plugin("add", AddOperation())
@@ -267,3 +378,171 @@ print(calculator.calculate("subtract", 10, 5))  # 5
 print(calculator.calculate("multiply", 10, 5))  # Operation not supported
 print(calculator.calculate("division",10,5)) # 2.0
 
+# Batch usage
+print(calculator.calculate_many("add", [1, 2, 3], [10, 20, 30]))       # [11 22 33]
+print(calculator.calculate_many("add", [2**60 + 1], [0]))              # [1152921504606846977], no float rounding
+print(calculator.calculate_many("division", [10, 20, 30], [5, 0, 3]))  # [2.0 -- 10.0]
+
+class MultiplyOperation:  # scalar-only plugin, calculate_many falls back to a loop
+    def execute(self, a, b):
+        return a * b
+
+calculator.add_plugin("multiply", MultiplyOperation())
+print(calculator.calculate_many("multiply", [1, 2, 3], [4, 5, 6]))     # [ 4 10 18]
+
+# Throughput on one million operand pairs
+import timeit
+a_values = np.random.default_rng(0).uniform(-100, 100, 1_000_000)
+b_values = np.random.default_rng(1).integers(-5, 5, 1_000_000).astype(float)
+a_list, b_list = a_values.tolist(), b_values.tolist()
+scalar_time = timeit.timeit(lambda: [calculator.calculate("add", a, b) for a, b in zip(a_list, b_list)], number=1)
+batch_time = timeit.timeit(lambda: calculator.calculate_many("add", a_values, b_values), number=1)
+print(f"1M additions: scalar={scalar_time:.3f}s batch={batch_time:.4f}s speedup={scalar_time / batch_time:.0f}x")
+division_time = timeit.timeit(lambda: calculator.calculate_many("division", a_values, b_values), number=1)
+print(f"1M divisions with ~10% zero denominators, masked: {division_time:.4f}s")
+
+
+
+# Example: Compiling formula strings over the registered plugins
+"""Evaluating "add(x, division(y, 3))" op by op means a dictionary lookup and a calculate() call for every
+operation, every time. compile() parses the formula once (ast), checks every operation against self.plugins,
+and generates one plain Python function whose globals hold the already-resolved execute methods.
+The compiled formula is cached per expression string; adding a plugin clears the cache."""
+
+import ast
+
+class CompiledFormula:
+    def __init__(self, expression, variables, scalar_func, batch_func):
+        self.expression = expression
+        self.variables = variables  # parameter names in order of first appearance
+        self.func = scalar_func  # the generated function itself, call it directly in hot loops
+        self._batch = batch_func
+
+    def __call__(self, *args, **bindings):
+        return self.func(*args, **bindings)
+
+    def evaluate_many(self, *arrays, **bindings):
+        """Each variable is bound to an array; the whole formula runs once over all rows"""
+        arrays = [np.asanyarray(a) for a in arrays]  # asanyarray keeps the mask of masked inputs
+        bindings = {name: np.asanyarray(a) for name, a in bindings.items()}
+        return self._batch(*arrays, **bindings)
+
+    def __repr__(self):
+        return f"CompiledFormula({self.expression!r}, variables={self.variables})"
+
+
+def _loop_batch(execute):
+    """Batch adapter for plugins that only define execute(a, b). Masked pairs (e.g. from a division
+    by zero further in) are skipped and stay masked in the result"""
+    def run(a, b):
+        masked_input = isinstance(a, np.ma.MaskedArray) or isinstance(b, np.ma.MaskedArray)
+        mask = np.ma.getmaskarray(a) | np.ma.getmaskarray(b)
+        a, b, mask = np.broadcast_arrays(np.ma.getdata(a), np.ma.getdata(b), mask)
+        values = [0 if skip else execute(x, y)
+                  for x, y, skip in zip(a.ravel().tolist(), b.ravel().tolist(), mask.ravel().tolist())]
+        result = np.array(values).reshape(a.shape)
+        return np.ma.masked_array(result, mask=mask) if masked_input else result
+    return run
+
+
+class FormulaCalculator(Calculator):
+    def __init__(self):
+        super().__init__()
+        self._compiled = {}  # {expression: CompiledFormula}
+
+    def add_plugin(self, name, operation):
+        super().add_plugin(name, operation)
+        self._compiled.clear()  # formulas hold resolved plugins, so they must be rebuilt
+
+    def compile(self, expression):
+        formula = self._compiled.get(expression)
+        if formula is None:
+            formula = self._compiled[expression] = self._compile(expression)
+        return formula
+
+    def evaluate(self, expression, **bindings):
+        return self.compile(expression)(**bindings)
+
+    def _compile(self, expression):
+        try:
+            tree = ast.parse(expression, mode="eval").body
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid formula {expression!r}: {exc.msg}") from None
+        variables, operations = [], {}  # operations: {plugin name: generated global name}
+
+        def emit(node):
+            if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+                return repr(node.value)
+            if (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub)
+                    and isinstance(node.operand, ast.Constant) and type(node.operand.value) in (int, float)):
+                return repr(-node.operand.value)
+            if isinstance(node, ast.Name):
+                if node.id.startswith("_"):
+                    raise ValueError(f"Invalid variable name {node.id!r}")
+                if node.id not in variables:
+                    variables.append(node.id)
+                return node.id
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+                name = node.func.id
+                if name not in self.plugins:
+                    raise ValueError(f"Operation not supported: {name!r}")
+                if len(node.args) != 2:
+                    raise ValueError(f"{name}() takes 2 arguments, got {len(node.args)}")
+                op = operations.setdefault(name, f"_op{len(operations)}")
+                return f"{op}({emit(node.args[0])}, {emit(node.args[1])})"
+            raise ValueError(f"Unsupported syntax in formula {expression!r}: {ast.unparse(node)}")
+
+        body = emit(tree)
+        source = f"def formula({', '.join(variables)}):\n    return {body}\n"
+        code = compile(source, f"<formula {expression!r}>", "exec")
+
+        scalar_globals, batch_globals = {"__builtins__": {}}, {"__builtins__": {}}
+        for name, op in operations.items():
+            plugin = self.plugins[name]
+            scalar_globals[op] = plugin.execute
+            batch = getattr(plugin, "execute_batch", None)
+            batch_globals[op] = batch if batch is not None else _loop_batch(plugin.execute)
+        exec(code, scalar_globals)
+        exec(code, batch_globals)
+        return CompiledFormula(expression, variables, scalar_globals["formula"], batch_globals["formula"])
+
+# Usage
+calculator = FormulaCalculator()
+calculator.add_plugin("add", AddOperation())
+calculator.add_plugin("subtract", SubtractOperation())
+calculator.add_plugin("division", DivisionOperation())
+calculator.add_plugin("multiply", MultiplyOperation())
+
+formula = calculator.compile("add(x, division(y, 3))")
+print(formula)                        # CompiledFormula('add(x, division(y, 3))', variables=['x', 'y'])
+print(formula(x=1, y=6))              # 3.0
+print(formula(1, 6))                  # 3.0 (positional, in the order of formula.variables)
+print(calculator.compile("add(x, division(y, 3))") is formula)  # True (cached)
+print(formula.evaluate_many(x=[1, 2, 3], y=[3, 6, 9]))          # [2. 4. 6.]
+print(calculator.compile("multiply(division(x, y), 2)").evaluate_many(x=[10, 20], y=[5, 0]))  # [4.0 --]
+print(calculator.compile("division(x, y)").evaluate_many(x=[10, 20, 30], y=[5, 0, 3]))  # [2.0 -- 10.0]
+print(calculator.compile("subtract(multiply(x, -2), 1)").evaluate_many(x=[1, 2, 3]))  # [-3 -5 -7]
+
+for bad in ("power(x, 2)", "add(x)", "x + 1", "add(x, __import__)"):
+    try:
+        calculator.compile(bad)
+    except ValueError as e:
+        print(e)
+# Output:
+# Operation not supported: 'power'
+# add() takes 2 arguments, got 1
+# Unsupported syntax in formula 'x + 1': x + 1
+# Invalid variable name '__import__'
+
+# Interpreted (calculate per op) vs compiled scalar vs compiled bulk, over one million bindings
+def interpreted(calc, x, y):
+    return calc.calculate("add", x, calc.calculate("division", y, 3))
+
+x_values, y_values = a_values[:1_000_000], np.abs(b_values) + 1
+x_list, y_list = x_values.tolist(), y_values.tolist()
+interpreted_time = timeit.timeit(lambda: [interpreted(calculator, x, y) for x, y in zip(x_list, y_list)], number=1)
+run = formula.func
+compiled_time = timeit.timeit(lambda: [run(x, y) for x, y in zip(x_list, y_list)], number=1)
+bulk_time = timeit.timeit(lambda: formula.evaluate_many(x=x_values, y=y_values), number=1)
+print(f"1M x add(x, division(y, 3)): interpreted={interpreted_time:.3f}s "
+      f"compiled={compiled_time:.3f}s bulk={bulk_time:.4f}s")
@@ -1,68 +1,235 @@
-#Example: ComplexMatrix class that represents a 2x2 matrix of complex numbers. [Cover mostly dunder methods]
+#Example: ComplexMatrix class that represents an N x N (or rows x cols) matrix of complex numbers. [Cover mostly dunder methods]
+# All elements live in one contiguous complex128 numpy buffer, so add, scale, equality and determinant
+# run as vectorized operations instead of element by element Python loops.
+import os
+
+import numpy as np
+
 class ComplexMatrix:
-    def __init__(self, a, b, c, d):
-        self.matrix = [[complex(a), complex(b)], [complex(c), complex(d)]]
+    def __init__(self, *values, shape=None):
+        # ComplexMatrix(a, b, c, d) still builds a 2x2 matrix, other sizes need shape=(rows, cols)
+        if shape is None:
+            if len(values) != 4:
+                raise ValueError("shape=(rows, cols) is required unless exactly 4 values are given")
+            shape = (2, 2)
+        rows, cols = shape
+        if len(values) != rows * cols:
+            raise ValueError(f"expected {rows * cols} values for shape {shape}, got {len(values)}")
+        self.data = np.array(values, dtype=np.complex128).reshape(rows, cols)
+
+    # Alternate constructors working directly on the buffer
+    @classmethod
+    def from_array(cls, array, copy=True):
+        obj = cls.__new__(cls)
+        # On NumPy 2 np.array(copy=False) means "never copy" and fails for other dtypes, asarray copies only when needed
+        array = np.array(array, dtype=np.complex128) if copy else np.asarray(array, dtype=np.complex128)
+        if array.ndim != 2:
+            raise ValueError("ComplexMatrix needs a 2-D array")
+        obj.data = array
+        return obj
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls.from_array(rows)
+
+    @classmethod
+    def zeros(cls, rows, cols=None):
+        return cls.from_array(np.zeros((rows, rows if cols is None else cols), dtype=np.complex128), copy=False)
+
+    @classmethod
+    def identity(cls, n):
+        return cls.from_array(np.eye(n, dtype=np.complex128), copy=False)
+
+    @classmethod
+    def from_buffer(cls, buffer, shape):
+        """Wrap any buffer-protocol object holding complex128 values (bytes, bytearray, mmap, memoryview) without copying"""
+        return cls.from_array(np.frombuffer(buffer, dtype=np.complex128).reshape(shape), copy=False)
+
+    # Persistence: save writes the raw buffer in .npy format, open maps the file with mmap so even a
+    # multi-GB matrix opens instantly and pages are read from disk only when they are touched
+    def save(self, path):
+        # Through a file object: np.save(path) would append ".npy" and open(path) would not find the file
+        with open(path, "wb") as file:
+            np.save(file, np.ascontiguousarray(self.data), allow_pickle=False)
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """mode "r" is read-only, "r+" writes changes back to the file, "c" is copy-on-write"""
+        mapped = np.load(path, mmap_mode=mode, allow_pickle=False)
+        obj = cls.from_array(mapped, copy=False)
+        obj._mapping = mapped
+        return obj
+
+    def flush(self):
+        """Write dirty pages of a matrix opened with mode="r+" back to its file"""
+        mapping = getattr(self, "_mapping", None)
+        if mapping is not None:
+            mapping.flush()
+
+    # Buffer export: matrix.memoryview() shares memory with the matrix, no boxing per element.
+    # Views such as ComplexMatrixBatch[i] are strided, a shared flat buffer is impossible for them
+    def memoryview(self):
+        if not self.data.flags.c_contiguous:
+            raise BufferError("matrix data is not contiguous, copy it with ComplexMatrix.from_array(m.data)")
+        return memoryview(self.data)
+
+    # PEP 688 (Python 3.12+) lets memoryview(matrix) and bytes(matrix) use the buffer directly
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+    def __release_buffer__(self, view):
+        view.release()
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def lazy(self):
+        """Opt into lazy mode: arithmetic on the result builds an expression tree instead of temporaries"""
+        return LazyComplexMatrix("leaf", self)
+
+    @property
+    def matrix(self):
+        """Read-only nested list copy kept for callers that used the old list of lists storage.
+        Writes like m.matrix[0][0] = x change only the copy, use m[0, 0] = x instead"""
+        return self.data.tolist()
 
     # __str__ and __repr__ for string representation
     def __str__(self):
-        return f"{self.matrix[0]}\n{self.matrix[1]}"
-    
+        return "\n".join(str(row) for row in self.data.tolist())
+
     def __repr__(self):
-        return f"ComplexMatrix({self.matrix[0][0]}, {self.matrix[0][1]}, {self.matrix[1][0]}, {self.matrix[1][1]})"
+        values = ", ".join(str(value) for value in self.data.ravel().tolist())
+        if self.data.shape == (2, 2):
+            return f"ComplexMatrix({values})"
+        return f"ComplexMatrix({values}, shape={self.data.shape})"
 
     # __len__ to get the number of elements
     def __len__(self):
-        return 4  # 2x2 matrix
+        return self.data.size
 
     # __getitem__ and __setitem__ for indexing
     def __getitem__(self, index):
         row, col = index
-        return self.matrix[row][col]
+        return complex(self.data[row, col])
 
     def __setitem__(self, index, value):
         row, col = index
-        self.matrix[row][col] = complex(value)
+        self.data[row, col] = complex(value)
+
+    # add, sub and scale take an optional out= ComplexMatrix that receives the result,
+    # so accumulation loops can reuse one buffer instead of allocating a new matrix each time
+    def add(self, other, out=None):
+        self._check_shape(other)
+        if out is None:
+            return type(self).from_array(self.data + other.data, copy=False)
+        np.add(self.data, other.data, out=out.data)
+        return out
+
+    def sub(self, other, out=None):
+        self._check_shape(other)
+        if out is None:
+            return type(self).from_array(self.data - other.data, copy=False)
+        np.subtract(self.data, other.data, out=out.data)
+        return out
+
+    def scale(self, scalar, out=None):
+        if out is None:
+            return type(self).from_array(self.data * scalar, copy=False)
+        np.multiply(self.data, scalar, out=out.data)
+        return out
+
+    def _check_shape(self, other):
+        if self.data.shape != other.data.shape:
+            raise ValueError(f"shape mismatch {self.data.shape} vs {other.data.shape}")
 
     # __add__, __radd__, and __iadd__ for addition
     def __add__(self, other):
         if isinstance(other, ComplexMatrix):
-            return ComplexMatrix(
-                self[0, 0] + other[0, 0], self[0, 1] + other[0, 1],
-                self[1, 0] + other[1, 0], self[1, 1] + other[1, 1]
-            )
+            return self.add(other)
         return NotImplemented
 
     def __radd__(self, other):
         return self + other
 
+    # In-place operators write straight into the existing buffer, no temporary matrix
     def __iadd__(self, other):
-        result = self + other
-        self.matrix = result.matrix
-        return self
+        if isinstance(other, ComplexMatrix):
+            return self.add(other, out=self)
+        return NotImplemented
 
-    # __mul__ and __rmul__ for scalar multiplication
+    # __sub__ and __isub__ for subtraction
+    def __sub__(self, other):
+        if isinstance(other, ComplexMatrix):
+            return self.sub(other)
+        return NotImplemented
+
+    def __isub__(self, other):
+        if isinstance(other, ComplexMatrix):
+            return self.sub(other, out=self)
+        return NotImplemented
+
+    # __mul__, __rmul__ and __imul__ for scalar multiplication
     def __mul__(self, scalar):
         if isinstance(scalar, (int, float, complex)):
-            return ComplexMatrix(
-                self[0, 0] * scalar, self[0, 1] * scalar,
-                self[1, 0] * scalar, self[1, 1] * scalar
-            )
+            return self.scale(scalar)
         return NotImplemented
 
     def __rmul__(self, scalar):
         return self * scalar
 
+    def __imul__(self, scalar):
+        if isinstance(scalar, (int, float, complex)):
+            return self.scale(scalar, out=self)
+        return NotImplemented
+
+    # __matmul__ for matrix product, one numpy call: the BLAS behind it already tiles for the cache and
+    # uses every core, so splitting into tiles on a Python thread pool on top of it only oversubscribes the CPU
+    def __matmul__(self, other):
+        if not isinstance(other, ComplexMatrix):
+            return NotImplemented
+        if self.data.shape[1] != other.data.shape[0]:
+            raise ValueError(f"cannot multiply {self.data.shape} by {other.data.shape}")
+        return type(self).from_array(self.data @ other.data, copy=False)
+
+    # __pow__ for integer powers by repeated squaring: O(log k) matrix products
+    def __pow__(self, k):
+        if not isinstance(k, int):
+            return NotImplemented
+        rows, cols = self.data.shape
+        if rows != cols:
+            raise ValueError("power needs a square matrix")
+        base = np.linalg.inv(self.data) if k < 0 else self.data
+        k = abs(k)
+        result = np.eye(rows, dtype=np.complex128)
+        while k:
+            if k & 1:
+                result = result @ base
+            k >>= 1
+            if k:
+                base = base @ base
+        return type(self).from_array(result, copy=False)
+
     # __eq__ for comparison
     def __eq__(self, other):
-        return self.matrix == other.matrix
+        if not isinstance(other, ComplexMatrix):
+            return NotImplemented
+        return self.data.shape == other.data.shape and bool(np.array_equal(self.data, other.data))
 
     # __call__ to calculate the determinant
     def __call__(self):
-        return self[0, 0] * self[1, 1] - self[0, 1] * self[1, 0]
+        rows, cols = self.data.shape
+        if rows != cols:
+            raise ValueError("determinant needs a square matrix")
+        if rows == 2:
+            m = self.data
+            return complex(m[0, 0] * m[1, 1] - m[0, 1] * m[1, 0])
+        # numpy.linalg.det factorizes with LAPACK LU (partial pivoting): det = sign * product of the U diagonal
+        return complex(np.linalg.det(self.data))
 
-    # __iter__ to iterate over elements in the matrix
+    # __iter__ to iterate over elements in the matrix (row by row)
     def __iter__(self):
-        return iter([self[0, 0], self[0, 1], self[1, 0], self[1, 1]])
+        return iter(self.data.ravel().tolist())
 
     # Context management (__enter__ and __exit__)
     def __enter__(self):
@@ -76,6 +243,7 @@ class ComplexMatrix:
     def __del__(self):
         print("ComplexMatrix instance is being deleted")
 
+
 # Usage Example
 with ComplexMatrix(1+2j, 2+3j, 4+5j, 6+7j) as matrix:
     print("Matrix:")
@@ -109,3 +277,369 @@ with ComplexMatrix(1+2j, 2+3j, 4+5j, 6+7j) as matrix:
     print("\nIs matrix equal to other_matrix?", matrix == other_matrix)
 
 print("\nOutside the context, matrix should be cleaned up")
+
+
+#Example: N x N ComplexMatrix, the same dunder API works for any size
+import timeit
+
+rng = np.random.default_rng(0)
+# Entries scaled by 1/sqrt(n) so the determinant of a 512x512 matrix stays inside float range
+big = ComplexMatrix.from_array((rng.standard_normal((512, 512)) + 1j * rng.standard_normal((512, 512))) / 512**0.5)
+big2 = ComplexMatrix.from_array((rng.standard_normal((512, 512)) + 1j * rng.standard_normal((512, 512))) / 512**0.5)
+
+print("\nShape:", big.shape, "Length:", len(big))
+print("512x512 add   :", timeit.timeit(lambda: big + big2, number=10) / 10, "sec")
+print("512x512 scale :", timeit.timeit(lambda: 2 * big, number=10) / 10, "sec")
+print("512x512 equal :", timeit.timeit(lambda: big == big2, number=10) / 10, "sec")
+print("512x512 det   :", timeit.timeit(big, number=1), "sec")
+
+three = ComplexMatrix(1, 2j, 3, 4, 5, 6 - 1j, 7, 8, 10, shape=(3, 3))
+print("3x3 determinant:", three())
+
+
+#Example: ComplexMatrixBatch, a whole stack of 2x2 matrices stored as structure-of-arrays
+# Row k of `data` holds element k (a, b, c, d) of every matrix, so each operation is one vectorized call
+# over all matrices instead of millions of ComplexMatrix objects (each with its own dict, buffer and __del__).
+import tracemalloc
+
+class ComplexMatrixBatch:
+    def __init__(self, a, b, c, d):
+        self.data = np.array([a, b, c, d], dtype=np.complex128)
+        if self.data.ndim != 2:
+            raise ValueError("a, b, c and d must be 1-D sequences of equal length")
+
+    @classmethod
+    def from_array(cls, array, copy=True):
+        obj = cls.__new__(cls)
+        array = np.array(array, dtype=np.complex128) if copy else np.asarray(array, dtype=np.complex128)
+        if array.ndim != 2 or array.shape[0] != 4:
+            raise ValueError("ComplexMatrixBatch needs a (4, n) array")
+        obj.data = array
+        return obj
+
+    @classmethod
+    def from_matrices(cls, matrices):
+        return cls.from_array(np.stack([m.data.ravel() for m in matrices], axis=1), copy=False)
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __repr__(self):
+        return f"ComplexMatrixBatch(<{len(self)} matrices>)"
+
+    # Integer index gives a ComplexMatrix view (writes go back into the batch), slices give a batch view
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ComplexMatrixBatch.from_array(self.data[:, index], copy=False)
+        return ComplexMatrix.from_array(self.data[:, index].reshape(2, 2), copy=False)
+
+    def determinant(self):
+        a, b, c, d = self.data
+        return a * d - b * c
+
+    __call__ = determinant
+
+    def __add__(self, other):
+        if isinstance(other, ComplexMatrixBatch):
+            return ComplexMatrixBatch.from_array(self.data + other.data, copy=False)
+        if isinstance(other, ComplexMatrix) and other.shape == (2, 2):
+            return ComplexMatrixBatch.from_array(self.data + other.data.reshape(4, 1), copy=False)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    # Scale every matrix by one scalar or by its own entry of a length-n array of scalars
+    def __mul__(self, scalar):
+        if isinstance(scalar, (int, float, complex)):
+            return ComplexMatrixBatch.from_array(self.data * scalar, copy=False)
+        if isinstance(scalar, np.ndarray) and scalar.shape == (len(self),):
+            return ComplexMatrixBatch.from_array(self.data * scalar, copy=False)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    # Elementwise comparison: one bool per matrix
+    def __eq__(self, other):
+        if isinstance(other, ComplexMatrixBatch):
+            return np.all(self.data == other.data, axis=0)
+        if isinstance(other, ComplexMatrix) and other.shape == (2, 2):
+            return np.all(self.data == other.data.reshape(4, 1), axis=0)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else ~result
+
+
+rng = np.random.default_rng(1)
+count = 100_000
+values = rng.standard_normal((4, count)) + 1j * rng.standard_normal((4, count))
+
+batch = ComplexMatrixBatch(*values)
+print("\nBatch:", batch, "first determinant:", batch.determinant()[0])
+view = batch[0]
+view[0, 0] = 0  # writes through to the batch storage
+print("After writing through the view:", batch.data[0, 0], view())
+print("Equal to itself:", (batch == batch).all(), "batch + batch == 2 * batch:", ((batch + batch) == 2 * batch).all())
+
+# Benchmark against a list of ComplexMatrix objects (printing __del__ silenced so only the math is measured)
+class QuietComplexMatrix(ComplexMatrix):
+    def __del__(self):
+        pass
+
+tracemalloc.start()
+objects = [QuietComplexMatrix(*column) for column in values.T.tolist()]
+objects_bytes = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+tracemalloc.start()
+batch = ComplexMatrixBatch(*values)
+batch_bytes = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+def run_objects():
+    determinants = [m() for m in objects]
+    results = [(m + m) * 2 for m in objects]
+    del results  # drop the temporaries inside the timed region too
+    return determinants
+
+def run_batch():
+    determinants = batch.determinant()
+    results = (batch + batch) * 2
+    return determinants
+
+list_time = timeit.timeit(run_objects, number=1)
+batch_time = timeit.timeit(run_batch, number=1)
+print(f"{count} matrices: det+add+scale list={list_time:.3f}s batch={batch_time:.5f}s speedup={list_time / batch_time:.0f}x")
+print(f"Memory: list={objects_bytes / 1e6:.1f} MB batch={batch_bytes / 1e6:.1f} MB ratio={objects_bytes / batch_bytes:.0f}x")
+del objects
+
+
+#Example: Allocation-free accumulation with in-place operators and out= targets
+def accumulation_benchmark(iterations):
+    """Accumulate 0.5 * step three ways and count how many matrices each loop allocates"""
+
+    class CountingComplexMatrix(QuietComplexMatrix):
+        created = 0
+
+        def __new__(cls, *args, **kwargs):
+            cls.created += 1
+            return super().__new__(cls)
+
+    step = CountingComplexMatrix(1 + 1j, 2, 3, 4 - 1j)
+
+    def run(label, loop):
+        acc = CountingComplexMatrix(0, 0, 0, 0)
+        CountingComplexMatrix.created = 0
+        seconds = timeit.timeit(lambda: loop(acc), number=1)
+        print(f"{label:<26} {seconds:.3f}s  matrices allocated={CountingComplexMatrix.created}")
+
+    def rebinding(acc):
+        for _ in range(iterations):
+            acc = acc + 0.5 * step  # two temporaries per iteration
+
+    def in_place(acc):
+        for _ in range(iterations):
+            acc += 0.5 * step  # only the scaled temporary
+
+    def with_out(acc):
+        scratch = CountingComplexMatrix(0, 0, 0, 0)
+        for _ in range(iterations):
+            step.scale(0.5, out=scratch)
+            acc += scratch
+
+    run("acc = acc + 0.5 * step", rebinding)
+    run("acc += 0.5 * step", in_place)
+    run("scale(out=) then +=", with_out)
+
+# The counts scale linearly, pass 10_000_000 for the full-size run
+accumulation_benchmark(200_000)
+
+
+#Example: Lazy expression graphs, `2 * a.lazy() + b + c` is evaluated once, when it is first read
+# +, - and scalar * only build nodes. On the first __getitem__/__iter__/__eq__/__call__ the tree is
+# flattened into a sum of coefficient * leaf terms and accumulated into a single output buffer.
+class LazyComplexMatrix:
+    def __init__(self, op, *operands):
+        self.op = op              # "leaf", "add", "sub" or "scale"
+        self.operands = operands  # leaf: (ComplexMatrix,), add/sub: (node, node), scale: (node, scalar)
+        self._value = None
+
+    @staticmethod
+    def _wrap(other):
+        if isinstance(other, LazyComplexMatrix):
+            return other
+        if isinstance(other, ComplexMatrix):
+            return other.lazy()
+        return None
+
+    # Building the tree
+    def __add__(self, other):
+        other = self._wrap(other)
+        return NotImplemented if other is None else LazyComplexMatrix("add", self, other)
+
+    def __radd__(self, other):
+        other = self._wrap(other)
+        return NotImplemented if other is None else LazyComplexMatrix("add", other, self)
+
+    def __sub__(self, other):
+        other = self._wrap(other)
+        return NotImplemented if other is None else LazyComplexMatrix("sub", self, other)
+
+    def __rsub__(self, other):
+        other = self._wrap(other)
+        return NotImplemented if other is None else LazyComplexMatrix("sub", other, self)
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, (int, float, complex)):
+            return LazyComplexMatrix("scale", self, scalar)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def _terms(self):
+        """Flatten the tree into {id(leaf): [coefficient, leaf]}, merging repeated leaves"""
+        terms = {}
+        stack = [(self, 1)]
+        while stack:
+            node, coefficient = stack.pop()
+            if node.op == "leaf":
+                leaf = node.operands[0]
+                terms.setdefault(id(leaf), [0, leaf])[0] += coefficient
+            elif node.op == "add":
+                stack.append((node.operands[0], coefficient))
+                stack.append((node.operands[1], coefficient))
+            elif node.op == "sub":
+                stack.append((node.operands[0], coefficient))
+                stack.append((node.operands[1], -coefficient))
+            else:
+                stack.append((node.operands[0], coefficient * node.operands[1]))
+        return terms.values()
+
+    def evaluate(self):
+        """Run the fused pass once: one output buffer, one scratch buffer, no per-operator temporaries"""
+        if self._value is None:
+            terms = list(self._terms())
+            shape = terms[0][1].shape
+            if any(leaf.shape != shape for _, leaf in terms):
+                raise ValueError("shape mismatch in lazy expression")
+            out = np.zeros(shape, dtype=np.complex128)
+            scratch = np.empty(shape, dtype=np.complex128)
+            for coefficient, leaf in terms:
+                if coefficient == 1:
+                    np.add(out, leaf.data, out=out)
+                elif coefficient != 0:
+                    np.multiply(leaf.data, coefficient, out=scratch)
+                    np.add(out, scratch, out=out)
+            self._value = ComplexMatrix.from_array(out, copy=False)
+        return self._value
+
+    # Reading the value forces evaluation
+    @property
+    def shape(self):
+        return self.evaluate().shape
+
+    def __len__(self):
+        return len(self.evaluate())
+
+    def __getitem__(self, index):
+        return self.evaluate()[index]
+
+    def __iter__(self):
+        return iter(self.evaluate())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyComplexMatrix):
+            other = other.evaluate()
+        return self.evaluate() == other
+
+    def __call__(self):
+        return self.evaluate()()
+
+    def __str__(self):
+        return str(self.evaluate())
+
+    def __repr__(self):
+        if self.op == "leaf":
+            return "M" + str(self.operands[0].shape)
+        if self.op == "scale":
+            return f"({self.operands[1]} * {self.operands[0]!r})"
+        symbol = "+" if self.op == "add" else "-"
+        return f"({self.operands[0]!r} {symbol} {self.operands[1]!r})"
+
+
+first = ComplexMatrix(1 + 2j, 2 + 3j, 4 + 5j, 6 + 7j)
+second = ComplexMatrix(1, 1, 1, 1)
+third = ComplexMatrix(0, 1j, 1j, 0)
+
+expression = 2 * first.lazy() + second + third - first
+print("\nLazy expression:", repr(expression))
+print("Lazy result == eager result:", expression == 2 * first + second + third - first)
+print("Lazy determinant:", expression())
+
+# Long formula on large matrices: eager allocates one matrix per operator, lazy allocates one in total.
+# Every scaled operand is made lazy too, otherwise 3 * b would be evaluated eagerly before joining the tree
+a = ComplexMatrix.from_array(rng.standard_normal((1024, 1024)) + 0j)
+b = ComplexMatrix.from_array(rng.standard_normal((1024, 1024)) + 0j)
+c = ComplexMatrix.from_array(rng.standard_normal((1024, 1024)) + 0j)
+eager_time = timeit.timeit(lambda: 2 * a + 3 * b + c - a + 0.5 * c, number=5) / 5
+lazy_time = timeit.timeit(lambda: (2 * a.lazy() + 3 * b.lazy() + c - a + 0.5 * c.lazy()).evaluate(), number=5) / 5
+print(f"1024x1024 five-operator formula: eager={eager_time:.4f}s lazy={lazy_time:.4f}s")
+
+
+#Example: Matrix product (@) and integer powers (**)
+rotation = ComplexMatrix(0, -1, 1, 0)
+print("\nrotation @ rotation:", repr(rotation @ rotation))
+print("rotation ** 4 is identity:", rotation ** 4 == ComplexMatrix.identity(2))
+print("rotation ** -1:", repr(rotation ** -1))
+
+def naive_matmul(a, b):
+    """Textbook triple loop over Python complex values, the baseline for the benchmark"""
+    rows, inner, cols = len(a), len(b), len(b[0])
+    out = [[0j] * cols for _ in range(rows)]
+    for i in range(rows):
+        for j in range(cols):
+            total = 0j
+            for k in range(inner):
+                total += a[i][k] * b[k][j]
+            out[i][j] = total
+    return out
+
+def matmul_benchmark(sizes, naive_limit=128):
+    for n in sizes:
+        left = ComplexMatrix.from_array(rng.standard_normal((n, n)) + 1j * rng.standard_normal((n, n)))
+        right = ComplexMatrix.from_array(rng.standard_normal((n, n)) + 1j * rng.standard_normal((n, n)))
+        vectorized = timeit.timeit(lambda: left @ right, number=3) / 3
+        line = f"n={n:<5} ComplexMatrix @={vectorized:.5f}s"
+        if n <= naive_limit:
+            rows_a, rows_b = left.matrix, right.matrix
+            naive = timeit.timeit(lambda: naive_matmul(rows_a, rows_b), number=1)
+            line += f" naive={naive:.4f}s speedup={naive / vectorized:.0f}x"
+        print(line)
+
+matmul_benchmark([32, 64, 128, 512, 1024])
+
+
+#Example: Zero-copy buffer export, construction from a buffer and mmap persistence
+import tempfile
+
+raw = bytearray(ComplexMatrix(1, 2, 3, 4).memoryview())  # 4 complex128 values = 64 bytes
+shared = ComplexMatrix.from_buffer(raw, (2, 2))
+memoryview(raw)[0:16] = ComplexMatrix(9j, 0, 0, 0).memoryview().cast("B")[0:16]  # edit the bytes underneath
+print("\nMatrix built on a bytearray sees the edit:", shared[0, 0])
+
+view = shared.memoryview()
+print("memoryview format/shape/nbytes:", view.format, view.shape, view.nbytes)
+
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "checkpoint.npy")
+    big.save(path)
+    open_time = timeit.timeit(lambda: ComplexMatrix.open(path), number=1)
+    mapped = ComplexMatrix.open(path)
+    print(f"Opened {os.path.getsize(path) / 1e6:.1f} MB checkpoint in {open_time * 1000:.2f} ms, equal: {mapped == big}")
+
+    writable = ComplexMatrix.open(path, mode="r+")
+    writable[0, 0] = 42
+    writable.flush()  # push the dirty page to disk
+    print("Change written through the map:", ComplexMatrix.open(path)[0, 0])
+    del mapped, writable  # release the maps before the folder is removed
@@ -146,3 +146,74 @@ invoke_function(lambda a,b: a+b, 5,6)
 # function result: python 3
 # function result: Hello, World!
 # function result: 11
+
+
+# Example: Iterative factorial with binary splitting and a lookup table
+# factorial() in Example 4 recurses once per n (RecursionError near n=1000) and multiplies a huge
+# number by a small one every step. Binary splitting multiplies numbers of similar size instead:
+# product(1..n) = product(1..mid) * product(mid+1..n), which big-integer multiplication handles much faster.
+
+def range_product(lo, hi):
+    """Product of the integers lo+1 .. hi (1 for an empty range), split in halves iteratively"""
+    if hi - lo <= 0:
+        return 1
+    # Leaf products of 32 consecutive numbers, then multiply neighbours pairwise until one is left
+    parts = []
+    for start in range(lo + 1, hi + 1, 32):
+        part = 1
+        for k in range(start, min(start + 32, hi + 1)):
+            part *= k
+        parts.append(part)
+    while len(parts) > 1:
+        paired = [parts[i] * parts[i + 1] for i in range(0, len(parts) - 1, 2)]
+        if len(parts) % 2:
+            paired.append(parts[-1])
+        parts = paired
+    return parts[0]
+
+SMALL_FACTORIALS = [1]  # 0! .. 255!
+for k in range(1, 256):
+    SMALL_FACTORIALS.append(SMALL_FACTORIALS[-1] * k)
+
+def fast_factorial(n):
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if n < len(SMALL_FACTORIALS):
+        return SMALL_FACTORIALS[n]
+    return range_product(0, n)
+
+def permutations(n, k):
+    """n! / (n-k)!, only the top k factors are multiplied"""
+    if not 0 <= k <= n:
+        return 0
+    return range_product(n - k, n)
+
+def binomial(n, k):
+    """n! / (k! (n-k)!), computed as product(n-k+1..n) // k! with the smaller k"""
+    if not 0 <= k <= n:
+        return 0
+    k = min(k, n - k)
+    return permutations(n, k) // fast_factorial(k)
+
+print(fast_factorial(5))   # Output: 120
+print(permutations(5, 2))  # Output: 20
+print(binomial(5, 2))      # Output: 10
+
+# Benchmark: simple loop vs binary splitting vs math.factorial (which uses the same idea in C)
+import math
+import timeit
+
+def loop_factorial(n):
+    result = 1
+    for k in range(2, n + 1):
+        result *= k
+    return result
+
+for n in (10_000, 100_000, 1_000_000):
+    line = f"n={n:<9} binary splitting={timeit.timeit(lambda: fast_factorial(n), number=1):.3f}s"
+    line += f" math.factorial={timeit.timeit(lambda: math.factorial(n), number=1):.3f}s"
+    if n <= 100_000:  # the loop is quadratic, 10^6 takes minutes
+        line += f" loop={timeit.timeit(lambda: loop_factorial(n), number=1):.3f}s"
+    print(line)
+
+print("binomial(10^5, 5*10^4) == math.comb:", binomial(10**5, 5 * 10**4) == math.comb(10**5, 5 * 10**4))
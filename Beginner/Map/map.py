@@ -112,4 +112,262 @@ print(squared_data)
 3    16
 dtype: int64
 
-'''
\ No newline at end of file
+'''
+
+#Example 9: Columnar PointArray instead of map() over Point objects
+# x and y live in two contiguous float arrays, so distance_from_origin() is one vectorized call
+# for every point instead of one Python method call and one **0.5 per point.
+import timeit
+import numpy as np
+
+class PointArray:
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x and y must be 1-D arrays of the same length")
+
+    @classmethod
+    def from_points(cls, points):
+        points = list(points)
+        return cls([point.x for point in points], [point.y for point in points])
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        return Point(float(self.x[index]), float(self.y[index]))
+
+    def distance_from_origin(self):
+        # x*x + y*y then sqrt in place, one temporary array (np.hypot is overflow-safe but ~3x slower)
+        distance = self.x * self.x
+        distance += self.y * self.y
+        return np.sqrt(distance, out=distance)
+
+    # Elementwise + and -, same rules as Point.__add__/__sub__ in class_object.py
+    def __add__(self, other):
+        if isinstance(other, PointArray):
+            return PointArray(self.x + other.x, self.y + other.y)
+        raise TypeError(f"{other} is not PointArray type")
+
+    def __sub__(self, other):
+        if isinstance(other, PointArray):
+            return PointArray(self.x - other.x, self.y - other.y)
+        raise TypeError(f"{other} is not PointArray type")
+
+    # predicate gets the whole PointArray and returns a boolean mask
+    def filter(self, predicate):
+        mask = np.asarray(predicate(self), dtype=bool)
+        return PointArray(self.x[mask], self.y[mask])
+
+    def __repr__(self):
+        return f"PointArray(<{len(self)} points>)"
+
+
+point_array = PointArray.from_points(points)
+print(point_array.distance_from_origin())  # [ 2.23606798  5.         13.        ]
+print(len(point_array.filter(lambda p: p.distance_from_origin() < 10)))  # 2
+
+# 10 million points
+rng = np.random.default_rng(0)
+many = PointArray(rng.uniform(-100, 100, 10_000_000), rng.uniform(-100, 100, 10_000_000))
+shift = PointArray(np.ones(len(many)), np.ones(len(many)))
+print("distance :", timeit.timeit(many.distance_from_origin, number=1), "sec")
+print("add      :", timeit.timeit(lambda: many + shift, number=1), "sec")
+print("filter   :", timeit.timeit(lambda: many.filter(lambda p: p.distance_from_origin() < 50), number=1), "sec")
+
+# The same work with map() over one million Point objects, for comparison
+objects = [Point(x, y) for x, y in zip(many.x[:1_000_000].tolist(), many.y[:1_000_000].tolist())]
+print("map() over 1M Point objects:", timeit.timeit(lambda: list(map(lambda point: point.distance_from_origin(), objects)), number=1), "sec")
+
+
+#Example 10: Uniform grid spatial index over Points for radius, k-nearest and bounding-box queries
+# Points are bucketed into square cells of side `cell_size`, so a query only looks at the cells it
+# overlaps instead of scanning every point. Ids returned by queries index into grid.x / grid.y.
+import math
+
+class PointGrid:
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.alive = np.empty(0, dtype=bool)
+        self.size = 0      # slots used in x / y / alive
+        self.count = 0     # live points
+        self.cell_bounds = None  # (cx_min, cx_max, cy_min, cy_max) seen so far, bounds the k-NN search
+        self.cells = {}    # cell key -> array of point ids
+
+    @classmethod
+    def from_array(cls, point_array, cell_size):
+        grid = cls(cell_size)
+        grid.size = grid.count = len(point_array)
+        grid.x = point_array.x.copy()
+        grid.y = point_array.y.copy()
+        grid.alive = np.ones(grid.size, dtype=bool)
+        # Bulk build: sort ids by cell key once and cut the sorted run into per-cell slices
+        keys = grid._keys(grid.x, grid.y)
+        order = np.argsort(keys, kind="stable")
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        for key, ids in zip(unique_keys.tolist(), np.split(order, starts[1:])):
+            grid.cells[key] = ids
+        if grid.size:
+            grid.cell_bounds = (grid._cell(grid.x.min()), grid._cell(grid.x.max()),
+                                grid._cell(grid.y.min()), grid._cell(grid.y.max()))
+        return grid
+
+    @classmethod
+    def from_points(cls, points, cell_size):
+        return cls.from_array(PointArray.from_points(points), cell_size)
+
+    # A cell (cx, cy) is packed into one int64 key, offsets keep both halves non-negative
+    def _cell(self, value):
+        return math.floor(value / self.cell_size)
+
+    def _keys(self, x, y):
+        cx = np.floor(x / self.cell_size).astype(np.int64)
+        cy = np.floor(y / self.cell_size).astype(np.int64)
+        return ((cx + 2**30) << 32) | (cy + 2**31)
+
+    @staticmethod
+    def _key(cx, cy):
+        return ((cx + 2**30) << 32) | (cy + 2**31)
+
+    def __len__(self):
+        return self.count
+
+    # Incremental updates
+    def insert(self, x, y):
+        if self.size == len(self.x):
+            capacity = max(16, 2 * len(self.x))
+            for name in ("x", "y", "alive"):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+        point_id = self.size
+        self.x[point_id], self.y[point_id], self.alive[point_id] = x, y, True
+        self.size += 1
+        self.count += 1
+        cx, cy = self._cell(x), self._cell(y)
+        if self.cell_bounds is None:
+            self.cell_bounds = (cx, cx, cy, cy)
+        else:
+            cx_min, cx_max, cy_min, cy_max = self.cell_bounds
+            self.cell_bounds = (min(cx_min, cx), max(cx_max, cx), min(cy_min, cy), max(cy_max, cy))
+        key = self._key(cx, cy)
+        self.cells[key] = np.append(self.cells.get(key, np.empty(0, dtype=np.int64)), point_id)
+        return point_id
+
+    def delete(self, point_id):
+        if not self.alive[point_id]:
+            raise KeyError(point_id)
+        self.alive[point_id] = False
+        self.count -= 1
+        key = self._key(self._cell(self.x[point_id]), self._cell(self.y[point_id]))
+        ids = self.cells[key]
+        self.cells[key] = ids[ids != point_id]
+
+    def point(self, point_id):
+        return Point(float(self.x[point_id]), float(self.y[point_id]))
+
+    # Queries
+    def _ids_in_cells(self, cx_min, cx_max, cy_min, cy_max):
+        empty = np.empty(0, dtype=np.int64)
+        if self.cell_bounds is None:
+            return empty
+        # Cells outside the data's extent are empty, so the range is clipped to cell_bounds first
+        bx_min, bx_max, by_min, by_max = self.cell_bounds
+        cx_min, cx_max = max(cx_min, bx_min), min(cx_max, bx_max)
+        cy_min, cy_max = max(cy_min, by_min), min(cy_max, by_max)
+        if cx_min > cx_max or cy_min > cy_max:
+            return empty
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self.cells):
+            # More cells in the range than occupied cells: walk the occupied ones instead
+            found = [ids for key, ids in self.cells.items()
+                     if cx_min <= (key >> 32) - 2**30 <= cx_max and cy_min <= (key & 0xFFFFFFFF) - 2**31 <= cy_max]
+        else:
+            found = [self.cells.get(self._key(cx, cy), empty)
+                     for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)]
+        return np.concatenate(found) if found else empty
+
+    def bbox_query(self, x_min, y_min, x_max, y_max):
+        ids = self._ids_in_cells(self._cell(x_min), self._cell(x_max), self._cell(y_min), self._cell(y_max))
+        x, y = self.x[ids], self.y[ids]
+        return ids[(x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)]
+
+    def radius_query(self, qx, qy, r):
+        ids = self.bbox_query(qx - r, qy - r, qx + r, qy + r)
+        dx, dy = self.x[ids] - qx, self.y[ids] - qy
+        return ids[dx * dx + dy * dy <= r * r]
+
+    def _nearest(self, ids, qx, qy, k):
+        dx, dy = self.x[ids] - qx, self.y[ids] - qy
+        distance = dx * dx + dy * dy
+        nearest = np.argpartition(distance, k - 1)[:k]
+        return ids[nearest[np.argsort(distance[nearest])]], distance[nearest].max()
+
+    def knn(self, qx, qy, k):
+        """k nearest ids, closest first. Grows a square of cells ring by ring until the k-th
+        candidate is closer than the nearest unsearched cell can be."""
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+        cx, cy = self._cell(qx), self._cell(qy)
+        # Rings closer than the data's extent are empty: start at the first ring that reaches it
+        cx_min, cx_max, cy_min, cy_max = self.cell_bounds
+        ring = max(0, cx_min - cx, cx - cx_max, cy_min - cy, cy - cy_max)
+        found = [self._ids_in_cells(cx - ring, cx + ring, cy - ring, cy + ring)]
+        while True:
+            if (2 * ring + 1) ** 2 > len(self.cells):
+                # The square now covers more cells than are occupied, a scan of all live points is cheaper
+                return self._nearest(np.flatnonzero(self.alive[:self.size]), qx, qy, k)[0]
+            ids = np.concatenate(found)
+            if len(ids) >= k:
+                nearest, farthest = self._nearest(ids, qx, qy, k)
+                # Everything outside the searched square is at least `ring * cell_size` away
+                if farthest <= (ring * self.cell_size) ** 2:
+                    return nearest
+            ring += 1
+            found.append(self._ids_in_cells(cx - ring, cx + ring, cy + ring, cy + ring))
+            found.append(self._ids_in_cells(cx - ring, cx + ring, cy - ring, cy - ring))
+            found.append(self._ids_in_cells(cx - ring, cx - ring, cy - ring + 1, cy + ring - 1))
+            found.append(self._ids_in_cells(cx + ring, cx + ring, cy - ring + 1, cy + ring - 1))
+
+grid = PointGrid.from_points(points, cell_size=5)
+print(grid.radius_query(0, 0, 6))            # [0 1]
+nearest = grid.point(grid.knn(4, 4, 1)[0])
+print(nearest.x, nearest.y)                  # 3.0 4.0
+new_id = grid.insert(4, 4)
+print(grid.knn(4, 4, 1))                     # [3]
+grid.delete(new_id)
+print(grid.bbox_query(0, 0, 10, 10))         # [0 1]
+
+# Benchmark against the linear scan (vectorized, so the comparison is against the fastest scan)
+def spatial_index_benchmark(count, queries=200):
+    cloud = PointArray(rng.uniform(0, 1000, count), rng.uniform(0, 1000, count))
+    build = timeit.timeit(lambda: PointGrid.from_array(cloud, cell_size=1000 / math.sqrt(count / 8)), number=1)
+    index = PointGrid.from_array(cloud, cell_size=1000 / math.sqrt(count / 8))  # ~8 points per cell
+    centres = rng.uniform(0, 1000, (queries, 2)).tolist()
+
+    def scan_radius():
+        for qx, qy in centres:
+            dx, dy = cloud.x - qx, cloud.y - qy
+            np.flatnonzero(dx * dx + dy * dy <= 4.0)
+
+    def scan_knn():
+        for qx, qy in centres:
+            dx, dy = cloud.x - qx, cloud.y - qy
+            np.argpartition(dx * dx + dy * dy, 10)[:10]
+
+    results = {
+        "radius scan": scan_radius,
+        "radius grid": lambda: [index.radius_query(qx, qy, 2.0) for qx, qy in centres],
+        "10-NN scan ": scan_knn,
+        "10-NN grid ": lambda: [index.knn(qx, qy, 10) for qx, qy in centres],
+    }
+    print(f"{count} points, build {build:.2f}s, per query:")
+    for label, run in results.items():
+        print(f"  {label}: {timeit.timeit(run, number=1) / queries * 1e6:.0f} us")
+
+spatial_index_benchmark(1_000_000)